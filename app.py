@@ -4,24 +4,40 @@
 
 import streamlit as st
 import numpy as np
-import pickle
 import soundfile as sf
 import tempfile
 import matplotlib.pyplot as plt
 import networkx as nx
 import time
+import os
+import sys
+
+# src/ modules import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from ctqw_engine import basis_state, evolve_walk
+from hamiltonian_ops import noise_distribution, BIO_SEED
+from eigen_cache import load_or_compute
+from sparse_graph import load_sparse
+from mix_render import render_path
+from segment_cache import get_cache
+from virtual_segments import segment_source
+from feature_store import load_segments
 
 # ============================================================
 # CONFIG (HARD LOCKED)
 # ============================================================
 
-DB_PATH  = "database/master_db_features_norm.pkl"   # 64 segments ONLY
-ADJ_PATH = "database/adjacency_sym.npy"             # 64 x 64 ONLY
+DB_PATH  = "database/master_db_features_norm"       # 64 segments ONLY
+ADJ_PATH = "database/adjacency_sym.npz"             # 64 x 64 ONLY (CSR)
 
 SR = 22050
 DT = 0.05
 CROSSFADE_MS = 80
 
+AUDIO_CACHE_MB = 256      # decoded segment audio kept in memory (LRU)
+WARM_AUDIO_CACHE = True   # decode every segment once at startup
+
 st.set_page_config(layout="wide")
 st.title("Quantum–Biological Mashup Generator")
 
@@ -31,9 +47,9 @@ st.title("Quantum–Biological Mashup Generator")
 
 @st.cache_resource
 def load_db_and_graph():
-    with open(DB_PATH, "rb") as f:
-        db = pickle.load(f)
-    A = np.load(ADJ_PATH)
+    # lazy views: only the metadata columns the app reads get mapped
+    db = load_segments(DB_PATH)
+    A = load_sparse(ADJ_PATH)
 
     if len(db) != A.shape[0]:
         raise ValueError("DB and adjacency size mismatch")
@@ -45,13 +61,22 @@ db, A = load_db_and_graph()
 N = len(db)
 
 @st.cache_resource
-def build_graph(A):
-    G = nx.from_numpy_array(A)
+def build_graph(_A):
+    G = nx.from_scipy_sparse_array(_A)
     pos = nx.spring_layout(G, seed=42)
     return G, pos
 
 G, POS = build_graph(A)
 
+@st.cache_resource
+def load_audio_cache(_db):
+    cache = get_cache(AUDIO_CACHE_MB * 1024 ** 2)
+    if WARM_AUDIO_CACHE:
+        cache.warm((s.id, segment_source(s)) for s in _db)
+    return cache
+
+audio_cache = load_audio_cache(db)
+
 # ============================================================
 # SIDEBAR CONTROLS
 # ============================================================
@@ -87,36 +112,19 @@ STEP_DELAY = st.sidebar.slider("Graph Animation Speed", 0.05, 0.6, 0.25)
 
 generate = st.sidebar.button("Generate Mashup")
 
-# ============================================================
-# BIO OPERATOR
-# ============================================================
-
-def build_bio_operator(N):
-    rng = np.random.default_rng(42)
-    v = rng.normal(0, 1, N)
-    v /= np.linalg.norm(v) + 1e-12
-    return np.diag(v)
-
 # ============================================================
 # CTQW + ENAQT
 # ============================================================
 
-def run_quantum_walk(H, start_idx, T, dt, lambda_noise):
-    psi = np.zeros(N, dtype=complex)
-    psi[start_idx] = 1.0
-    probs = np.zeros((T, N))
-
-    deg = np.sum(np.abs(H), axis=1)
-    eta = deg / (deg.sum() + 1e-12)
-
-    for t in range(T):
-        probs[t] = np.abs(psi)**2
-        psi = psi - 1j * (H @ psi) * dt
-        if lambda_noise > 0:
-            psi = (1 - lambda_noise) * psi + lambda_noise * eta
-        psi /= np.linalg.norm(psi)
+def run_quantum_walk(lambda_bio, start_idx, T, dt, lambda_noise):
+    # H = D - A + lambda_bio * V_bio, diagonalized once per (graph, lambda_bio)
+    eigvals, eigvecs = load_or_compute(A, "laplacian", lambda_bio, BIO_SEED)
+    eta = noise_distribution(A, "laplacian", lambda_bio, BIO_SEED)
 
-    return probs
+    return evolve_walk(
+        eigvals, eigvecs, basis_state(N, start_idx),
+        T, dt, lambda_noise, eta
+    )
 
 # ============================================================
 # PATH EXTRACTION (FULL DIAGNOSTICS)
@@ -160,20 +168,14 @@ def extract_path(prob, A, prob_no_bio, L, stochastic):
 # AUDIO
 # ============================================================
 
-def crossfade(a, b, cf):
-    fade_out = np.linspace(1, 0, cf)
-    fade_in  = np.linspace(0, 1, cf)
-    a[-cf:] *= fade_out
-    b[:cf]  *= fade_in
-    return np.concatenate([a[:-cf], a[-cf:] + b[:cf], b[cf:]])
-
 def build_audio(path):
-    audio = None
     cf = int(CROSSFADE_MS * SR / 1000)
-    for idx in path:
-        y, _ = sf.read(db[idx].wav_path)
-        audio = y if audio is None else crossfade(audio, y, cf)
-    return audio / (np.max(np.abs(audio)) + 1e-9)
+    return render_path(
+        path,
+        lambda idx: audio_cache.get(db[idx].id, segment_source(db[idx])),
+        cf,
+        normalize=True
+    )
 
 # ============================================================
 # GRAPH DRAWING (FULL PATH HIGHLIGHT)
@@ -219,12 +221,8 @@ def draw_graph(step, prob_t, path, mode):
 
 if generate:
 
-    D = np.diag(A.sum(axis=1))
-    H_base = D - A
-    H_bio  = H_base + lambda_bio * build_bio_operator(N)
-
-    prob_no = run_quantum_walk(H_base, start_idx, T_steps, DT, lambda_noise)
-    prob_bi = run_quantum_walk(H_bio,  start_idx, T_steps, DT, lambda_noise)
+    prob_no = run_quantum_walk(0.0,        start_idx, T_steps, DT, lambda_noise)
+    prob_bi = run_quantum_walk(lambda_bio, start_idx, T_steps, DT, lambda_noise)
 
     stochastic = selection_mode.startswith("Stochastic")
     path, table = extract_path(prob_bi, A, prob_no, PATH_LEN, stochastic)
@@ -5,6 +5,11 @@ import soundfile as sf
 import numpy as np
 import os
 
+# src/ modules import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from mix_render import render_mix
+
 CROSSFADE = 0.05  # seconds overlap for smoother transitions
 
 def load_wav(path):
@@ -14,25 +19,8 @@ def load_wav(path):
     return y, sr
 
 def crossfade_concat(tracks, sr):
-    final = tracks[0]
     fade_samples = int(CROSSFADE * sr)
-
-    for i in range(1, len(tracks)):
-        a = final
-        b = tracks[i]
-
-        if fade_samples > len(a) or fade_samples > len(b):
-            final = np.concatenate([a, b])
-            continue
-
-        fade_out = np.linspace(1, 0, fade_samples)
-        fade_in  = np.linspace(0, 1, fade_samples)
-
-        mixed = (a[-fade_samples:] * fade_out) + (b[:fade_samples] * fade_in)
-
-        final = np.concatenate([a[:-fade_samples], mixed, b[fade_samples:]])
-
-    return final
+    return render_mix(tracks, fade_samples)
 
 def main():
     if len(sys.argv) < 3:
@@ -0,0 +1,235 @@
+# src/ann_index.py
+"""
+Approximate nearest-neighbour (IVF) index over segment features.
+
+The ℓ2-normalized 40-d features are clustered with spherical k-means
+into N / LIST_SIZE inverted lists. A query only scores the members of
+its n_probe closest lists, with the same compatibility score as the
+exact builder (cosine × SAME_SONG_PENALTY, see scoring.py), so a kNN
+graph costs ~N * n_probe * LIST_SIZE scored pairs instead of N² (plus
+N * n_lists 40-d dot products to pick the lists).
+
+n_probe is not fixed: by default it is doubled from N_PROBE until the
+recall on a sample of rows reaches TARGET_RECALL.
+
+Work is grouped per list: every query that probes a list is scored
+against all of its members in one block and merged into a running
+top-K, so nothing loops over individual segments in Python.
+
+knn_recall() measures the result against exact top-K on a row sample.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from scoring import compatibility_scores
+
+LIST_SIZE = 256           # target members per inverted list
+N_PROBE = 8               # starting n_probe for the recall search
+TARGET_RECALL = 0.9       # recall@K the automatic n_probe must reach
+RECALL_SAMPLE = 1000      # rows used to estimate recall
+KMEANS_ITERS = 10
+TRAIN_PER_LIST = 32       # k-means training points per list
+MAX_TRAIN = 131072        # cap on the k-means training sample
+ASSIGN_BLOCK = 65536      # rows scored against the centroids at once
+RECALL_BLOCK = 64         # exact rows per block in knn_recall
+SEED = 0
+
+
+def _unit_rows(M):
+    norms = np.linalg.norm(M, axis=1, keepdims=True)
+    return M / np.maximum(norms, 1e-12)
+
+
+def _top_lists(Q, centroids, n, block=ASSIGN_BLOCK):
+    """
+    (len(Q), n) indices of the n most similar centroids per row.
+    """
+    out = np.empty((len(Q), n), dtype=np.int64)
+    for r0 in range(0, len(Q), block):
+        s = Q[r0:r0 + block] @ centroids.T
+        if n == 1:
+            out[r0:r0 + block, 0] = np.argmax(s, axis=1)
+        else:
+            out[r0:r0 + block] = np.argpartition(s, -n, axis=1)[:, -n:]
+    return out
+
+
+class IVFIndex:
+    """
+    Inverted-file index: spherical k-means centroids + member lists.
+
+    Usage:
+        index = IVFIndex().fit(X, codes)
+        nbr_idx, nbr_score = index.search(X, codes, K, self_ids=np.arange(N))
+    """
+
+    def __init__(self, n_lists: int = None, n_probe: int = N_PROBE, seed: int = SEED):
+        # n_lists=None -> N / LIST_SIZE lists
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+
+    def fit(self, X: np.ndarray, codes: np.ndarray) -> "IVFIndex":
+        X = np.asarray(X, dtype=np.float32)
+        N = len(X)
+        n_lists = self.n_lists or max(1, round(N / LIST_SIZE))
+        n_lists = min(n_lists, N)
+        rng = np.random.default_rng(self.seed)
+
+        # spherical k-means on a training sample
+        n_train = min(N, max(n_lists, min(n_lists * TRAIN_PER_LIST, MAX_TRAIN)))
+        train = X[rng.choice(N, size=n_train, replace=False)]
+        centroids = train[rng.choice(len(train), size=n_lists, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERS):
+            assign = _top_lists(train, centroids, 1)[:, 0]
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            filled = np.bincount(assign, minlength=n_lists) > 0
+            centroids[filled] = _unit_rows(sums[filled])     # empty lists keep their centroid
+
+        # inverted lists, stored CSR-style
+        assign = _top_lists(X, centroids, 1)[:, 0]
+        self.order = np.argsort(assign, kind="stable")
+        self.offsets = np.searchsorted(assign[self.order], np.arange(n_lists + 1))
+
+        self.X = X
+        self.codes = np.asarray(codes)
+        self.centroids = centroids
+        self.n_lists = n_lists
+        return self
+
+    def members(self, l: int) -> np.ndarray:
+        return self.order[self.offsets[l]:self.offsets[l + 1]]
+
+    def search(self, Q: np.ndarray, q_codes: np.ndarray, K: int,
+               self_ids: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-K compatibility neighbours for every query row.
+
+        self_ids[i] (optional) is query i's own index in the indexed
+        set, excluded from its results. Returns (idx, score), both
+        (len(Q), K); slots that found no candidate hold -1 / -inf.
+        """
+        Q = np.asarray(Q, dtype=np.float32)
+        q_codes = np.asarray(q_codes)
+        nq = len(Q)
+        n_probe = min(self.n_probe, self.n_lists)
+
+        best_i = np.full((nq, K), -1, dtype=np.int64)
+        best_s = np.full((nq, K), -np.inf, dtype=np.float32)
+
+        # invert query -> probed lists into list -> probing queries
+        probes = _top_lists(Q, self.centroids, n_probe).ravel()
+        by_list = np.argsort(probes, kind="stable")
+        q_of = by_list // n_probe
+        bounds = np.searchsorted(probes[by_list], np.arange(self.n_lists + 1))
+
+        for l in range(self.n_lists):
+            qs = q_of[bounds[l]:bounds[l + 1]]
+            mem = self.members(l)
+            if len(qs) == 0 or len(mem) == 0:
+                continue
+
+            S = compatibility_scores(Q[qs], q_codes[qs], self.X[mem], self.codes[mem])
+            if self_ids is not None:
+                S[self_ids[qs][:, None] == mem[None, :]] = -np.inf
+
+            cand_s = np.concatenate([best_s[qs], S], axis=1)
+            cand_i = np.concatenate([best_i[qs], np.broadcast_to(mem, S.shape)], axis=1)
+            top = np.argpartition(cand_s, -K, axis=1)[:, -K:]
+            best_s[qs] = np.take_along_axis(cand_s, top, axis=1)
+            best_i[qs] = np.take_along_axis(cand_i, top, axis=1)
+
+        return best_i, best_s
+
+
+# ======================================
+# RECALL
+# ======================================
+def _exact_topk(X, codes, rows, K):
+    """
+    Exact top-K neighbour indices (self excluded) of the given rows.
+    """
+    out = np.empty((len(rows), K), dtype=np.int64)
+    for b0 in range(0, len(rows), RECALL_BLOCK):
+        block = rows[b0:b0 + RECALL_BLOCK]
+        S = compatibility_scores(X[block], codes[block], X, codes)
+        S[np.arange(len(block)), block] = -np.inf
+        out[b0:b0 + len(block)] = np.argpartition(S, -K, axis=1)[:, -K:]
+    return out
+
+
+def _recall(exact, approx) -> float:
+    hits = sum(len(np.intersect1d(e, a[a >= 0])) for e, a in zip(exact, approx))
+    return hits / exact.size
+
+
+def _sample_rows(N, sample, seed):
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(N, size=min(sample, N), replace=False))
+
+
+def tune_n_probe(index: IVFIndex, K: int, target: float = TARGET_RECALL,
+                 sample: int = RECALL_SAMPLE, seed: int = SEED + 1) -> tuple[int, float]:
+    """
+    Smallest n_probe (N_PROBE doubled) whose sampled recall@K reaches
+    `target`; sets it on the index. Returns (n_probe, recall).
+    The default seed keeps its sample apart from knn_recall's.
+    """
+    X, codes = index.X, index.codes
+    rows = _sample_rows(len(X), sample, seed)
+    exact = _exact_topk(X, codes, rows, K)
+
+    n_probe = min(N_PROBE, index.n_lists)
+    while True:
+        index.n_probe = n_probe
+        approx, _ = index.search(X[rows], codes[rows], K, self_ids=rows)
+        recall = _recall(exact, approx)
+        if recall >= target or n_probe >= index.n_lists:
+            return n_probe, recall
+        n_probe = min(2 * n_probe, index.n_lists)
+
+
+# ======================================
+# KNN GRAPH
+# ======================================
+def ann_knn_adjacency(X: np.ndarray, codes: np.ndarray, K: int,
+                      n_lists: int = None, n_probe: int = None,
+                      target_recall: float = TARGET_RECALL) -> sp.csr_matrix:
+    """
+    Approximate counterpart of sparse_graph.knn_adjacency_streaming.
+
+    n_probe=None picks it with tune_n_probe(target_recall).
+    """
+    N = len(X)
+    index = IVFIndex(n_lists).fit(X, codes)
+    if n_probe is None:
+        n_probe, recall = tune_n_probe(index, K, target_recall)
+        print(f"[ANN] {index.n_lists} lists, n_probe={n_probe} (sampled recall@{K} {recall:.3f})")
+    else:
+        index.n_probe = n_probe
+    idx, score = index.search(X, codes, K, self_ids=np.arange(N))
+
+    found = np.isfinite(score)
+    rows = np.repeat(np.arange(N), K).reshape(N, K)[found]
+    A_raw = sp.csr_matrix(
+        (score[found].astype(float), (rows, idx[found])), shape=(N, N)
+    )
+    A_raw.sort_indices()
+    return A_raw
+
+
+def knn_recall(A_approx: sp.spmatrix, X: np.ndarray, codes: np.ndarray, K: int,
+               sample: int = RECALL_SAMPLE, seed: int = SEED) -> float:
+    """
+    Mean fraction of the exact top-K neighbours (self excluded) that
+    A_approx also keeps, over a random sample of rows.
+    """
+    rows = _sample_rows(len(X), sample, seed)
+    exact = _exact_topk(X, codes, rows, K)
+
+    A_approx = sp.csr_matrix(A_approx)
+    approx = [A_approx.indices[A_approx.indptr[r]:A_approx.indptr[r + 1]] for r in rows]
+    return _recall(exact, approx)
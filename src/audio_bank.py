@@ -0,0 +1,179 @@
+# src/audio_bank.py
+"""
+Packed segment audio bank.
+
+All segment audio lives in ONE contiguous float32 file plus an index:
+    database/audio_bank.f32         raw float32 samples, back to back
+    database/audio_bank.index.npz   name, id, global_index, offset, length
+
+Readers memory-map the data file and hand out zero-copy views, so a
+render touches no per-segment files at all. A new bank is written to a
+scratch file and moved into place on close(), so open readers keep
+their mapping of the old one.
+"""
+
+import os
+
+import numpy as np
+
+BANK_PATH = "database/audio_bank"
+TARGET_SR = 22050
+
+DATA_SUFFIX = ".f32"
+INDEX_SUFFIX = ".index.npz"
+TMP_SUFFIX = ".tmp"
+
+
+def bank_exists(path: str = BANK_PATH) -> bool:
+    return os.path.exists(path + INDEX_SUFFIX)
+
+
+def _load_index(path):
+    with np.load(path + INDEX_SUFFIX) as f:
+        return {name: f[name] for name in f.files}
+
+
+def _save_index(path, index):
+    tmp = path + TMP_SUFFIX + INDEX_SUFFIX
+    np.savez(tmp, **index)
+    os.replace(tmp, path + INDEX_SUFFIX)
+
+
+# ======================================
+# WRITER
+# ======================================
+class AudioBankWriter:
+    """
+    Append segments to a bank; the index is written on close().
+
+    Usage:
+        with AudioBankWriter() as bank:
+            bank.add("song_bar_00", audio)
+    """
+
+    def __init__(self, path: str = BANK_PATH, sr: int = TARGET_SR, append: bool = False):
+        self.path = path
+        self.sr = sr
+
+        self.names, self.offsets, self.lengths = [], [], []
+        self.ids, self.global_indices = [], []
+        self.append = append
+        if append and not bank_exists(path) and os.path.exists(path + DATA_SUFFIX):
+            raise ValueError(f"{path}{DATA_SUFFIX} exists but has no index; cannot append")
+        if append and bank_exists(path):
+            index = _load_index(path)
+            if int(index["sr"]) != sr:
+                raise ValueError(f"Bank sample rate {int(index['sr'])} != {sr}")
+            self.names = list(index["name"])
+            self.offsets = list(index["offset"])
+            self.lengths = list(index["length"])
+            self.ids = list(index["id"])
+            self.global_indices = list(index["global_index"])
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # appending never moves existing samples, so it can write in place
+        self._data_path = path + DATA_SUFFIX if append else path + TMP_SUFFIX + DATA_SUFFIX
+        self._f = open(self._data_path, "ab" if append else "wb")
+        self._cursor = int(self.offsets[-1] + self.lengths[-1]) if self.offsets else 0
+
+    def add(self, name: str, audio: np.ndarray) -> tuple[int, int]:
+        """
+        Append one segment; returns (offset, length) in samples.
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        self._f.write(audio.tobytes())
+
+        offset = self._cursor
+        self.names.append(name)
+        self.offsets.append(offset)
+        self.lengths.append(len(audio))
+        self.ids.append(name)                       # relabelled by build_segments
+        self.global_indices.append(-1)
+        self._cursor += len(audio)
+        return offset, len(audio)
+
+    def close(self):
+        self._f.close()
+        if not self.append:
+            os.replace(self._data_path, self.path + DATA_SUFFIX)
+
+        n = len(self.names)
+        _save_index(self.path, {
+            "name": np.array(self.names, dtype=str),
+            "id": np.array(self.ids, dtype=str),
+            "global_index": np.array(self.global_indices, dtype=np.int64),
+            "offset": np.array(self.offsets, dtype=np.int64),
+            "length": np.array(self.lengths, dtype=np.int64),
+            "sr": np.int64(self.sr),
+        })
+        print(f"[BANK] {n} segments ({self._cursor} samples) → {self.path}{DATA_SUFFIX}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def label_segments(names, seg_ids, global_indices, path: str = BANK_PATH):
+    """
+    Attach Segment.id / global_index to bank entries (matched by slice name).
+    """
+    index = _load_index(path)
+    row_of = {name: r for r, name in enumerate(index["name"])}
+
+    ids = index["id"].astype(object)
+    gidx = index["global_index"].copy()
+    for name, seg_id, g in zip(names, seg_ids, global_indices):
+        r = row_of[name]
+        ids[r] = seg_id
+        gidx[r] = g
+
+    index["id"] = np.array(ids, dtype=str)
+    index["global_index"] = gidx
+    _save_index(path, index)
+
+
+# ======================================
+# READER
+# ======================================
+class AudioBank:
+    """
+    Read-only, memory-mapped view of a bank.
+
+    Segments are looked up by Segment.id, slice name or global_index.
+    """
+
+    def __init__(self, path: str = BANK_PATH):
+        index = _load_index(path)
+
+        self.sr = int(index["sr"])
+        self.offset = index["offset"]
+        self.length = index["length"]
+
+        self._row = {}
+        for r, (name, seg_id, g) in enumerate(zip(index["name"], index["id"], index["global_index"])):
+            self._row[str(name)] = r
+            self._row[str(seg_id)] = r
+            if g >= 0:
+                self._row[int(g)] = r
+
+        size = os.path.getsize(path + DATA_SUFFIX)
+        self.data = (
+            np.memmap(path + DATA_SUFFIX, dtype=np.float32, mode="r")
+            if size else np.zeros(0, dtype=np.float32)
+        )
+
+    def __len__(self):
+        return len(self.offset)
+
+    def __contains__(self, key):
+        return key in self._row
+
+    def get(self, key) -> np.ndarray:
+        """
+        Zero-copy float32 view of one segment.
+        """
+        r = self._row[key]
+        start = int(self.offset[r])
+        return self.data[start:start + int(self.length[r])]
@@ -31,31 +31,45 @@ def load_and_normalize_audio(path: str, sr: int = TARGET_SR) -> tuple[np.ndarray
     return y, sr
 
 
+def list_raw_wavs() -> list[str]:
+    """
+    Sorted .wav file names in RAW_SONGS_DIR.
+    """
+    return sorted(f for f in os.listdir(RAW_SONGS_DIR) if f.lower().endswith(".wav"))
+
+
+def process_raw_song(fname: str) -> np.ndarray:
+    """
+    Load + normalize one raw .wav and save it as <base>.npy in NPY_SONGS_DIR.
+    Returns the normalized waveform.
+    """
+    wav_path = os.path.join(RAW_SONGS_DIR, fname)
+    base_name = os.path.splitext(fname)[0]
+    npy_path = os.path.join(NPY_SONGS_DIR, base_name + ".npy")
+
+    print(f"[INFO] Processing {wav_path} -> {npy_path}")
+
+    y_norm, sr = load_and_normalize_audio(wav_path, sr=TARGET_SR)
+
+    # Save numpy file
+    np.save(npy_path, y_norm)
+
+    print(f"[DONE] {fname}: length = {len(y_norm)} samples, sr = {sr}")
+    return y_norm
+
+
 def process_all_raw_songs():
     """
     For each .wav file in RAW_SONGS_DIR:
         - load at TARGET_SR
         - normalize amplitude
         - save as .npy in the same folder (or NPY_SONGS_DIR)
+    (ingest.py does this plus slicing for all songs in parallel.)
     """
     os.makedirs(NPY_SONGS_DIR, exist_ok=True)
 
-    for fname in os.listdir(RAW_SONGS_DIR):
-        if not fname.lower().endswith(".wav"):
-            continue
-
-        wav_path = os.path.join(RAW_SONGS_DIR, fname)
-        base_name = os.path.splitext(fname)[0]
-        npy_path = os.path.join(NPY_SONGS_DIR, base_name + ".npy")
-
-        print(f"[INFO] Processing {wav_path} -> {npy_path}")
-
-        y_norm, sr = load_and_normalize_audio(wav_path, sr=TARGET_SR)
-
-        # Save numpy file
-        np.save(npy_path, y_norm)
-
-        print(f"[DONE] {fname}: length = {len(y_norm)} samples, sr = {sr}")
+    for fname in list_raw_wavs():
+        process_raw_song(fname)
 
 
 if __name__ == "__main__":
@@ -17,18 +17,22 @@ def get_bar_segments(song_name: str):
 
     tempo, bars = compute_bar_grid_for_song(song_name)
 
-    segments = []
-    for idx, (ts, te) in enumerate(bars):
-        segments.append({
-            "id": idx,
-            "start": float(ts),
-            "end": float(te)
-        })
+    segments = bar_dicts(bars)
     assert segments, f"No bars detected for {song_name}. Beat tracking failed?"
 
 
     return segments
 
+
+def bar_dicts(bars):
+    """
+    [(t_start, t_end), ...] -> [{"id", "start", "end"}, ...]
+    """
+    return [
+        {"id": idx, "start": float(ts), "end": float(te)}
+        for idx, (ts, te) in enumerate(bars)
+    ]
+
 if __name__ == "__main__":
     print("Running bar interface test...")
     out = get_bar_segments("gorila-315977") 
@@ -0,0 +1,97 @@
+# src/beat_cache.py
+"""
+Persistent beat-tracking cache.
+
+Beat tracking is the most expensive per-song stage and slicing.py,
+bar_interface.py / build_segments.py and ingest.py all need the same
+bar grid. Results are keyed by a content hash of
+    (normalized song audio, sr, BEATS_PER_BAR, MAX_BARS_PER_SONG)
+so an entry is reused only for the exact same audio and bar recipe.
+
+Layout (one small file per key):
+    database/beat_cache/<key>.npz   tempo, beat_times, bars (K, 2)
+"""
+
+import os
+import hashlib
+import tempfile
+
+import numpy as np
+
+CACHE_DIR = "database/beat_cache"
+
+
+# ======================================
+# KEYS
+# ======================================
+def cache_key(y: np.ndarray, sr: int, beats_per_bar: int, max_bars: int) -> str:
+    """
+    Content hash of the song audio plus the bar-grid parameters.
+    """
+    y = np.ascontiguousarray(y)
+
+    h = hashlib.sha256()
+    h.update(f"{y.dtype}|{y.shape}|{sr}|{beats_per_bar}|{max_bars}".encode())
+    h.update(y.tobytes())
+    return h.hexdigest()[:32]
+
+
+# ======================================
+# DISK STORE
+# ======================================
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, key + ".npz")
+
+
+def _load_entry(key, cache_dir):
+    path = _entry_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as f:
+        tempo = float(f["tempo"])
+        beat_times = f["beat_times"]
+        bars = [(float(ts), float(te)) for ts, te in f["bars"]]
+    return tempo, beat_times, bars
+
+
+def _save_entry(key, cache_dir, tempo, beat_times, bars):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # write a scratch file first so readers never see a partial entry
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".tmp_", suffix=".npz")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(
+            f,
+            tempo=np.float64(tempo),
+            beat_times=np.asarray(beat_times, dtype=np.float64),
+            bars=np.asarray(bars, dtype=np.float64).reshape(-1, 2),
+        )
+    os.replace(tmp, _entry_path(key, cache_dir))
+
+
+# ======================================
+# PUBLIC API
+# ======================================
+def load_or_track(y: np.ndarray,
+                  sr: int,
+                  beats_per_bar: int,
+                  max_bars: int,
+                  track,
+                  cache_dir: str = CACHE_DIR):
+    """
+    (tempo, beat_times, bars) for one song.
+
+    `track(y, sr)` runs the actual beat tracker on a miss and must
+    return the same triple (see slicing.track_bars).
+    """
+    key = cache_key(y, sr, beats_per_bar, max_bars)
+
+    result = _load_entry(key, cache_dir)
+    if result is not None:
+        print(f"[CACHE] Beat grid hit {key} ({len(result[2])} bars)")
+        return result
+
+    tempo, beat_times, bars = track(y, sr)
+    _save_entry(key, cache_dir, tempo, beat_times, bars)
+    return tempo, beat_times, bars
@@ -1,77 +1,76 @@
 # src/build_segments.py
 
 import os
-import pickle
 import csv
 from segment import Segment    # adjust if your Segment class is in src/segment.py
 from bar_interface import get_bar_segments
+from audio_bank import AudioBank, bank_exists, label_segments
+from slicing import VIRTUAL_SEGMENTS
+from virtual_segments import sample_range
+from feature_store import save_segments
 
 AUDIO_SEG_DIR = "database/audio_segments"
-MASTER_DB_PKL = "database/master_db.pkl"
+MASTER_DB_STORE = "database/master_db"
 MASTER_DB_CSV = "database/master_db.csv"
 
 
-def build_segments():
+def song_segments(song_idx, song_base, bars, global_idx, bank=None, key=None):
     """
-    Build Segment objects for ALL songs,
-    assuming Gagan already sliced and saved WAV files as:
-        database/audio_segments/<song_base>_bar_XX.wav
-    """
-
-    # Detect songs by scanning .npy files in raw_songs
-    raw_npy = sorted([
-        os.path.splitext(f)[0]
-        for f in os.listdir("raw_songs")
-        if f.endswith(".npy")
-    ])
-
-    segment_list = []
-    global_idx = 0
-
-    for song_idx, song_base in enumerate(raw_npy, start=1):
+    Segment objects for one song's bar dicts (see bar_interface).
 
-        print(f"\n[PROCESS] Building segments for {song_base}")
+    song_idx is the 1-based position of the song in sorted order and
+    global_idx the index of its first segment. key (if known, e.g. from
+    ingest.py) is the song-level key.
+    """
+    segments = []
 
-        # Get bar segments from your Day-3 code
-        bars = get_bar_segments(song_base)
+    for bar in bars:
 
-        for bar in bars:
+        bar_idx = bar["id"]
 
-            bar_idx = bar["id"]
+        # Your segment ID scheme
+        seg_id = f"S{song_idx:02d}_{bar_idx:02d}"
 
-            # Your segment ID scheme
-            seg_id = f"S{song_idx:02d}_{bar_idx:02d}"
+        # Gagan's expected filename
+        slice_name = f"{song_base}_bar_{bar_idx:02d}"
+        wav_path = os.path.join(AUDIO_SEG_DIR, slice_name + ".wav")
 
-            # Gagan's expected filename
-            wav_name = f"{song_base}_bar_{bar_idx:02d}.wav"
-            wav_path = os.path.join(AUDIO_SEG_DIR, wav_name)
+        in_bank = bank is not None and slice_name in bank
+        if not (VIRTUAL_SEGMENTS or in_bank or os.path.exists(wav_path)):
+            print(f"[WARN] Missing WAV file: {wav_path}")
+            continue
 
-            if not os.path.exists(wav_path):
-                print(f"[WARN] Missing WAV file: {wav_path}")
-                continue
+        # Create Segment object (your responsibility)
+        seg = Segment(
+            id=seg_id,
+            parent_song=song_base,
+            start_time=bar["start"],
+            end_time=bar["end"]
+        )
 
-            # Create Segment object (your responsibility)
-            seg = Segment(
-                id=seg_id,
-                parent_song=song_base,
-                start_time=bar["start"],
-                end_time=bar["end"]
-            )
+        # Add convenience attribute
+        seg.wav_path = wav_path
+        seg.global_index = global_idx
+        seg.slice_name = slice_name
+        seg.key = key
+        seg.start_sample, seg.end_sample = (
+            sample_range(bar["start"], bar["end"]) if VIRTUAL_SEGMENTS else (None, None)
+        )
 
-            # Add convenience attribute
-            seg.wav_path = wav_path
-            seg.global_index = global_idx
+        segments.append(seg)
+        global_idx += 1
 
-            segment_list.append(seg)
-            global_idx += 1
+    return segments
 
-    # Save pickle database
-    os.makedirs(os.path.dirname(MASTER_DB_PKL), exist_ok=True)
 
-    with open(MASTER_DB_PKL, "wb") as f:
-        pickle.dump(segment_list, f)
+def write_master_db(segment_list, bank=None):
+    """
+    Write the master DB feature store + CSV summary and label the audio bank (if any).
+    """
+    # Save columnar database (see feature_store.py)
+    save_segments(segment_list, MASTER_DB_STORE)
 
-    print(f"\nmaster DB written → {MASTER_DB_PKL}")
+    print(f"\nmaster DB written → {MASTER_DB_STORE}")
     print(f"Total segments: {len(segment_list)}")
 
     # Optional CSV for quick inspection
@@ -85,6 +84,52 @@ def build_segments():
 
     print(f"CSV summary written → {MASTER_DB_CSV}")
 
+    # Let the bank resolve Segment.id / global_index directly
+    if bank is not None:
+        banked = [s for s in segment_list if s.slice_name in bank]
+        label_segments(
+            [s.slice_name for s in banked],
+            [s.id for s in banked],
+            [s.global_index for s in banked],
+        )
+        print(f"Audio bank labelled: {len(banked)} segments")
+
+
+def build_segments():
+    """
+    Build Segment objects for ALL songs,
+    assuming Gagan already sliced and saved WAV files as:
+        database/audio_segments/<song_base>_bar_XX.wav
+    or packed them into the audio bank (slicing.PACK_AUDIO_BANK).
+
+    With slicing.VIRTUAL_SEGMENTS no audio files are needed: each segment
+    records (start_sample, end_sample) into raw_songs/<song_base>.npy.
+
+    (ingest.py runs the whole pipeline in parallel and ends here too.)
+    """
+
+    # Detect songs by scanning .npy files in raw_songs
+    raw_npy = sorted([
+        os.path.splitext(f)[0]
+        for f in os.listdir("raw_songs")
+        if f.endswith(".npy")
+    ])
+
+    bank = AudioBank() if bank_exists() else None
+
+    segment_list = []
+
+    for song_idx, song_base in enumerate(raw_npy, start=1):
+
+        print(f"\n[PROCESS] Building segments for {song_base}")
+
+        # Get bar segments from your Day-3 code
+        bars = get_bar_segments(song_base)
+
+        segment_list += song_segments(song_idx, song_base, bars, len(segment_list), bank)
+
+    write_master_db(segment_list, bank)
+
     return segment_list
 
 
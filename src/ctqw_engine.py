@@ -0,0 +1,267 @@
+# src/ctqw_engine.py
+"""
+CTQW Propagator Engine
+
+Exact continuous-time quantum walk evolution in the eigenbasis of H.
+
+H is diagonalized ONCE with eigh. Every time point is then just a
+phase factor on the eigen-coefficients:
+
+    |psi(t)> = V exp(-i E t) V^H |psi0>
+
+so a whole (T, N) probability matrix costs one batched multiply
+instead of T matrix exponentials or T Euler steps.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import expm_multiply
+
+HERMITIAN_TOL = 1e-8
+
+
+# ======================================
+# SPECTRAL DECOMPOSITION
+# ======================================
+def diagonalize(H: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    H (N, N) Hermitian -> (eigvals (N,), eigvecs (N, N))
+    Sparse H is densified: full eigh needs the dense matrix anyway.
+    """
+    H = H.toarray() if sp.issparse(H) else np.asarray(H)
+
+    if H.ndim != 2 or H.shape[0] != H.shape[1]:
+        raise ValueError(f"H must be square, got shape {H.shape}")
+
+    if not np.allclose(H, H.conj().T, atol=HERMITIAN_TOL):
+        raise ValueError("H must be Hermitian")
+
+    eigvals, eigvecs = np.linalg.eigh(H)
+    return eigvals, eigvecs
+
+
+def basis_state(N: int, idx: int) -> np.ndarray:
+    """
+    Localized initial state |idx>.
+    """
+    psi0 = np.zeros(N, dtype=complex)
+    psi0[idx] = 1.0
+    return psi0
+
+
+# ======================================
+# COHERENT EVOLUTION (BATCHED)
+# ======================================
+def evolve_probabilities(eigvals: np.ndarray,
+                         eigvecs: np.ndarray,
+                         psi0: np.ndarray,
+                         times: np.ndarray) -> np.ndarray:
+    """
+    Exact unitary evolution sampled at `times`.
+
+    Returns:
+        probs (T, N) with probs[t] = |<n|psi(times[t])>|^2
+    """
+    times = np.asarray(times, dtype=float)
+
+    c0 = eigvecs.conj().T @ psi0                        # (N,)
+    phases = np.exp(-1j * np.outer(times, eigvals))     # (T, N)
+    psi_t = (phases * c0) @ eigvecs.T                   # (T, N)
+
+    return np.abs(psi_t) ** 2
+
+
+# ======================================
+# STEPPED WALK + ENAQT DECOHERENCE
+# ======================================
+def evolve_walk(eigvals: np.ndarray,
+                eigvecs: np.ndarray,
+                psi0: np.ndarray,
+                T: int,
+                dt: float,
+                lambda_noise: float = 0.0,
+                eta: np.ndarray = None) -> np.ndarray:
+    """
+    T-step walk with optional decoherence mixing.
+
+    probs[t] is recorded BEFORE step t. One step is:
+        psi <- U(dt) psi                      (exact, no Euler error)
+        psi <- (1 - lambda) psi + lambda eta  (ENAQT mix)
+        psi <- psi / ||psi||
+
+    The recurrence runs on eigen-coefficients (O(N) per step, V is
+    unitary so norms are unchanged); amplitudes are recovered with a
+    single (T, N) x (N, N) multiply at the end.
+    """
+    if lambda_noise == 0:
+        return evolve_probabilities(eigvals, eigvecs, psi0, dt * np.arange(T))
+
+    if eta is None:
+        raise ValueError("eta is required when lambda_noise > 0")
+
+    step = np.exp(-1j * eigvals * dt)
+    c = eigvecs.conj().T @ psi0
+    c_eta = eigvecs.conj().T @ eta
+
+    coeffs = np.empty((T, len(eigvals)), dtype=complex)
+    for t in range(T):
+        coeffs[t] = c
+        c = (1 - lambda_noise) * (step * c) + lambda_noise * c_eta
+        c /= np.linalg.norm(c)
+
+    return np.abs(coeffs @ eigvecs.T) ** 2
+
+
+# ======================================
+# KRYLOV MODE (NO DIAGONALIZATION)
+# ======================================
+def iter_walk_chunks(H,
+                     psi0: np.ndarray,
+                     T: int,
+                     dt: float,
+                     lambda_noise: float = 0.0,
+                     eta: np.ndarray = None,
+                     chunk: int = 64,
+                     first_step: int = 0):
+    """
+    Stream the T-step walk as (t0, probs[t0:t0 + n]) chunks.
+
+    Uses the sparse exponential action exp(-i H t) psi (scipy's
+    expm_multiply), so H is never diagonalized or densified and memory
+    stays O(N * chunk). Step semantics match evolve_walk; the first
+    recorded sample is taken after `first_step` steps.
+    """
+    if lambda_noise > 0 and eta is None:
+        raise ValueError("eta is required when lambda_noise > 0")
+
+    gen = -1j * sp.csr_matrix(H)
+    gen_dt = gen * dt
+
+    def step(psi):
+        psi = expm_multiply(gen_dt, psi)
+        if lambda_noise > 0:
+            psi = (1 - lambda_noise) * psi + lambda_noise * eta
+        return psi / np.linalg.norm(psi)
+
+    psi = np.asarray(psi0, dtype=complex)
+    for _ in range(first_step):
+        psi = step(psi)
+
+    for t0 in range(0, T, chunk):
+        n = min(chunk, T - t0)
+
+        if lambda_noise == 0:
+            # whole chunk on one time grid; the extra endpoint seeds the next chunk
+            states = expm_multiply(gen, psi, start=0.0, stop=n * dt, num=n + 1, endpoint=True)
+            probs = np.abs(states[:n]) ** 2
+            psi = states[n] / np.linalg.norm(states[n])
+        else:
+            probs = np.empty((n, len(psi)))
+            for k in range(n):
+                probs[k] = np.abs(psi) ** 2
+                psi = step(psi)
+
+        yield t0, probs
+
+
+def stream_walk_to_npy(path: str,
+                       H,
+                       psi0: np.ndarray,
+                       T: int,
+                       dt: float,
+                       lambda_noise: float = 0.0,
+                       eta: np.ndarray = None,
+                       chunk: int = 64,
+                       first_step: int = 0) -> np.ndarray:
+    """
+    Krylov walk written chunk by chunk into a (T, N) .npy memmap.
+    """
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(T, len(psi0)))
+
+    for t0, probs in iter_walk_chunks(H, psi0, T, dt, lambda_noise, eta, chunk, first_step):
+        out[t0:t0 + len(probs)] = probs
+
+    out.flush()
+    return out
+
+
+# ======================================
+# BATCHED MULTI-START
+# ======================================
+BATCH_REDUCTIONS = (None, "mean", "max")
+
+
+def evolve_walk_batch(eigvals: np.ndarray,
+                      eigvecs: np.ndarray,
+                      starts,
+                      T: int,
+                      dt: float,
+                      lambda_noise: float = 0.0,
+                      eta: np.ndarray = None,
+                      reduce: str = None,
+                      batch_size: int = 256) -> np.ndarray:
+    """
+    evolve_walk from every node in `starts` at once.
+
+    The B initial states are the columns of an N x B coefficient
+    matrix, so each time step is one BLAS-3 (N, N) x (N, B) multiply
+    instead of B separate walks. Starts are processed `batch_size`
+    columns at a time to bound memory.
+
+    Returns:
+        reduce=None   -> probs (B, T, N)
+        reduce="mean" -> time-averaged distribution (B, N)
+        reduce="max"  -> peak probability over time (B, N)
+    """
+    if reduce not in BATCH_REDUCTIONS:
+        raise ValueError(f"Unknown reduction {reduce!r}, expected one of {BATCH_REDUCTIONS}")
+    if lambda_noise > 0 and eta is None:
+        raise ValueError("eta is required when lambda_noise > 0")
+
+    starts = np.atleast_1d(np.asarray(starts, dtype=int))
+    B, N = len(starts), len(eigvals)
+
+    shape = (B, T, N) if reduce is None else (B, N)
+    out = np.zeros(shape)
+
+    step = np.exp(-1j * eigvals * dt)[:, None]
+    if lambda_noise > 0:
+        c_eta = (eigvecs.conj().T @ eta)[:, None]
+
+    for b0 in range(0, B, batch_size):
+        cols = slice(b0, min(b0 + batch_size, B))
+
+        # V^H |s> is the conjugated row s of V
+        C = eigvecs[starts[cols]].conj().T               # (N, b)
+
+        for t in range(T):
+            P = (np.abs(eigvecs @ C) ** 2).T            # (b, N)
+
+            if reduce is None:
+                out[cols, t] = P
+            elif reduce == "mean":
+                out[cols] += P / T
+            else:
+                np.maximum(out[cols], P, out=out[cols])
+
+            C = step * C
+            if lambda_noise > 0:
+                C = (1 - lambda_noise) * C + lambda_noise * c_eta
+                C /= np.linalg.norm(C, axis=0)
+
+    return out
+
+
+def best_next_segments(prob: np.ndarray, starts, k: int = 1) -> np.ndarray:
+    """
+    (B, N) reduced probabilities -> (B, k) most likely next segments,
+    best first, never returning the start node itself.
+    """
+    starts = np.atleast_1d(np.asarray(starts, dtype=int))
+
+    scores = np.array(prob, dtype=float)
+    scores[np.arange(len(starts)), starts] = -np.inf
+
+    top = np.argpartition(scores, -k, axis=1)[:, -k:]
+    order = np.argsort(np.take_along_axis(scores, top, axis=1), axis=1)[:, ::-1]
+    return np.take_along_axis(top, order, axis=1)
@@ -0,0 +1,193 @@
+# src/ctqw_sweep.py
+"""
+Parameter sweeps over (lambda_noise, lambda_bio, dt, T).
+
+Work is shared wherever the physics allows it:
+- one Hamiltonian (and one eigendecomposition) per lambda_bio
+- one walk per (lambda_bio, lambda_noise, dt), run for the largest T
+  and sliced for every shorter T on the grid
+
+Walks are independent, so every (lambda_bio, lambda_noise, dt) walk is
+its own job in a process pool; with method="eigen" the decomposition of
+each lambda_bio is computed up front and workers read it from
+eigen_cache (its disk LRU is only trimmed once the sweep is done, so
+no prefilled entry is evicted under a running worker). All results go to ONE indexed store:
+    <out_dir>/probs.npy   (P, T_max, N) float32 memmap, NaN past each T
+    <out_dir>/index.npz   coordinate columns, row p <-> grid point p
+"""
+
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ctqw_engine import basis_state, evolve_walk, iter_walk_chunks
+from eigen_cache import load_or_compute, evict_disk
+from hamiltonian_ops import build_hamiltonian, noise_distribution, BIO_SEED
+
+SWEEP_METHODS = ("eigen", "krylov")
+ETA_MODES = ("degree", "uniform", "regime")
+
+# eta_mode="regime": degree-weighted noise below this lambda, uniform above
+NOISE_REGIME_SPLIT = 0.5
+
+COORDS = ("lambda_noise", "lambda_bio", "dt", "T")
+
+
+# ======================================
+# GRID
+# ======================================
+def sweep_grid(lambda_noise=(0.0,), lambda_bio=(0.0,), dt=(0.05,), T=(200,)) -> dict:
+    """
+    Cartesian product of the axes as coordinate columns (one row per point).
+    """
+    points = list(itertools.product(lambda_noise, lambda_bio, dt, T))
+    cols = np.array(points, dtype=float).reshape(-1, 4)
+
+    index = {name: cols[:, k] for k, name in enumerate(COORDS)}
+    index["T"] = index["T"].astype(int)
+    return index
+
+
+def _noise_vector(A, kind, lambda_bio, bio_seed, eta_mode, lambda_noise):
+    N = A.shape[0]
+    if eta_mode == "uniform" or (eta_mode == "regime" and lambda_noise >= NOISE_REGIME_SPLIT):
+        return np.ones(N) / N
+    return noise_distribution(A, kind, lambda_bio, bio_seed)
+
+
+# ======================================
+# WORKER (WALKS OF ONE lambda_bio)
+# ======================================
+def _run_group(A, kind, lambda_bio, bio_seed, start_idx, eta_mode, method,
+               rows, index, probs_path, first_step):
+    N = A.shape[0]
+    psi0 = basis_state(N, start_idx)
+    store = np.load(probs_path, mmap_mode="r+")
+
+    if method == "eigen":
+        eigvals, eigvecs = load_or_compute(A, kind, lambda_bio, bio_seed, evict=False)
+    else:
+        H = build_hamiltonian(A, kind, lambda_bio, bio_seed)
+
+    # rows sharing (lambda_noise, dt) share one walk of the longest T
+    walks = {}
+    for r in rows:
+        walks.setdefault((index["lambda_noise"][r], index["dt"][r]), []).append(r)
+
+    for (lam, dt), walk_rows in walks.items():
+        T_max = int(max(index["T"][r] for r in walk_rows))
+        eta = _noise_vector(A, kind, lambda_bio, bio_seed, eta_mode, lam)
+
+        if method == "eigen":
+            probs = evolve_walk(eigvals, eigvecs, psi0, T_max + first_step, dt, lam, eta)[first_step:]
+            chunks = [(0, probs)]
+        else:
+            chunks = iter_walk_chunks(H, psi0, T_max, dt, lam, eta, first_step=first_step)
+
+        for t0, probs in chunks:
+            for r in walk_rows:
+                t1 = min(t0 + len(probs), int(index["T"][r]))
+                if t1 > t0:
+                    store[r, t0:t1] = probs[:t1 - t0]
+
+    store.flush()
+    return len(rows)
+
+
+# ======================================
+# PUBLIC API
+# ======================================
+def run_sweep(A,
+              out_dir: str,
+              lambda_noise=(0.0,),
+              lambda_bio=(0.0,),
+              dt=(0.05,),
+              T=(200,),
+              start_idx: int = 0,
+              kind: str = "laplacian",
+              bio_seed: int = BIO_SEED,
+              eta_mode: str = "degree",
+              method: str = "eigen",
+              first_step: int = 0,
+              workers: int = None) -> dict:
+    """
+    Run every grid point and write the indexed result store.
+
+    Returns the coordinate index (same columns as index.npz).
+    """
+    if method not in SWEEP_METHODS:
+        raise ValueError(f"Unknown sweep method {method!r}, expected one of {SWEEP_METHODS}")
+    if eta_mode not in ETA_MODES:
+        raise ValueError(f"Unknown eta mode {eta_mode!r}, expected one of {ETA_MODES}")
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    index = sweep_grid(lambda_noise, lambda_bio, dt, T)
+    P, N = len(index["T"]), A.shape[0]
+    T_max = int(index["T"].max())
+
+    probs_path = os.path.join(out_dir, "probs.npy")
+    store = np.lib.format.open_memmap(probs_path, mode="w+", dtype=np.float32, shape=(P, T_max, N))
+    store[:] = np.nan
+    store.flush()
+    del store
+
+    np.savez(os.path.join(out_dir, "index.npz"), **index)
+
+    # one job per walk: rows sharing (lambda_bio, lambda_noise, dt)
+    walks = {}
+    for r in range(P):
+        key = (index["lambda_bio"][r], index["lambda_noise"][r], index["dt"][r])
+        walks.setdefault(key, []).append(r)
+
+    lambda_bios = sorted(set(index["lambda_bio"]))
+    print(f"[SWEEP] {P} grid points, {len(walks)} walks, "
+          f"{len(lambda_bios)} Hamiltonians ({method})")
+
+    if method == "eigen" and len(walks) > 1:
+        # fill eigen_cache once so parallel workers only read it
+        for lam_bio in lambda_bios:
+            load_or_compute(A, kind, lam_bio, bio_seed, evict=False)
+
+    jobs = [
+        (A, kind, lam_bio, bio_seed, start_idx, eta_mode, method, rows, index, probs_path, first_step)
+        for (lam_bio, _, _), rows in walks.items()
+    ]
+
+    if workers == 1 or len(jobs) == 1:
+        done = [_run_group(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_run_group, *zip(*jobs)))
+
+    if method == "eigen":
+        evict_disk()
+
+    print(f"[SWEEP] Done: {sum(done)} points → {out_dir}")
+    return index
+
+
+def load_sweep(out_dir: str) -> tuple[np.ndarray, dict]:
+    """
+    (probs memmap (P, T_max, N), coordinate index)
+    """
+    probs = np.load(os.path.join(out_dir, "probs.npy"), mmap_mode="r")
+    with np.load(os.path.join(out_dir, "index.npz")) as f:
+        index = {name: f[name] for name in f.files}
+    return probs, index
+
+
+def find_point(index: dict, **coords) -> int:
+    """
+    Row of the grid point matching every given coordinate.
+    """
+    mask = np.ones(len(index["T"]), dtype=bool)
+    for name, value in coords.items():
+        mask &= np.isclose(index[name], value)
+
+    rows = np.flatnonzero(mask)
+    if len(rows) != 1:
+        raise KeyError(f"{len(rows)} sweep points match {coords}")
+    return int(rows[0])
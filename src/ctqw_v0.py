@@ -8,24 +8,25 @@ Note: Baseline implementation (no decoherence, no measurements)
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.linalg import expm
 import os
+from ctqw_engine import diagonalize, basis_state, evolve_probabilities
+from sparse_graph import load_sparse
 
 # -----------------------
 # Paths
 # -----------------------
-H_PATH = "database/H_laplacian.npy"
+H_PATH = "database/H_laplacian.npz"
 OUT_DIR = "outputs"
 os.makedirs(OUT_DIR, exist_ok=True)
 
 # -----------------------
 # Load Hamiltonian
 # -----------------------
-H = np.load(H_PATH)
+H = load_sparse(H_PATH)
 
 assert H.ndim == 2
 assert H.shape[0] == H.shape[1]
-assert np.allclose(H, H.T, atol=1e-8), "H must be Hermitian"
+assert abs(H - H.T).max() <= 1e-8, "H must be Hermitian"
 
 N = H.shape[0]
 print(f"[LOAD] Hamiltonian loaded: {N} x {N}")
@@ -33,8 +34,7 @@ print(f"[LOAD] Hamiltonian loaded: {N} x {N}")
 # Initial state
 # -----------------------
 i0 = 0  # starting node index
-psi0 = np.zeros(N, dtype=complex)
-psi0[i0] = 1.0
+psi0 = basis_state(N, i0)
 
 # Sanity
 assert np.isclose(np.linalg.norm(psi0), 1.0)
@@ -48,21 +48,15 @@ times = np.linspace(0, t_max, num_steps)
 # -----------------------
 # Evolution
 # -----------------------
-prob_evolution = np.zeros((num_steps, N))
-
 print("[RUN] Starting CTQW evolution...")
 
-for idx, t in enumerate(times):
-    U = expm(-1j * H * t)
-    psi_t = U @ psi0
-
-    # Probability distribution
-    probs = np.abs(psi_t) ** 2
-    prob_evolution[idx] = probs
+# Diagonalize once, then every time point is a phase-factor multiply
+eigvals, eigvecs = diagonalize(H)
+prob_evolution = evolve_probabilities(eigvals, eigvecs, psi0, times)
 
-    # Probability conservation check
-    if not np.isclose(probs.sum(), 1.0, atol=1e-6):
-        raise RuntimeError("Probability not conserved!")
+# Probability conservation check
+if not np.allclose(prob_evolution.sum(axis=1), 1.0, atol=1e-6):
+    raise RuntimeError("Probability not conserved!")
 
 print("[DONE] Evolution complete")
 # -----------------------
@@ -1,38 +1,30 @@
 # src/day6_features.py
 
 import numpy as np
-import librosa
-import pickle
-import pywt
 from collections import defaultdict
-import soundfile as sf
-from spectral import extract_normalized_spectrogram
-
-
-MASTER_DB_PATH = "database/master_db.pkl"
+from spectral import extract_normalized_spectrograms
+from segment_cache import read_source
+from virtual_segments import segment_source
+from feature_store import load_segments, save_segments
+from wavelet_energy import envelopes, wavelet_energies, SCALES, WAVELET
+from feature_cache import (
+    segment_key, load_field, save_fields,
+    source_signature, lookup_source, remember_source,
+)
+from key_estimation import song_key
+
+
+MASTER_DB_PATH = "database/master_db"
 RAW_SONGS_DIR = "raw_songs"
 TARGET_SR = 22050
 
-# -----------------------------
-# KEY ESTIMATION (SONG-LEVEL)
-# -----------------------------
-KEYS = ['C','C#','D','D#','E','F','F#','G','G#','A','A#','B']
-
-def estimate_key(chroma):
-    """
-    Very simple key estimator:
-    Average chroma over time and pick the strongest pitch class.
-    """
-    chroma_mean = chroma.mean(axis=1)
-    key_idx = np.argmax(chroma_mean)
-    return KEYS[key_idx]
-
+INCREMENTAL = True   # reuse per-segment results from feature_cache.py
+FEATURIZE_BATCH = 256   # stale segments decoded + featurized at once
 
 # -----------------------------
 # LOAD SEGMENT DB
 # -----------------------------
-with open(MASTER_DB_PATH, "rb") as f:
-    segments = pickle.load(f)
+segments = load_segments(MASTER_DB_PATH)
 
 # -----------------------------
 # GLOBAL INDEX ASSIGNMENT (DAY 7)
@@ -51,47 +43,86 @@ print(f"[INFO] Loaded {len(segments)} segments from DB")
 print(f"[INFO] Found {len(segments_by_song)} songs")
 
 
+# -----------------------------
+# CONTENT FINGERPRINTS + CACHE LOOKUP
+# -----------------------------
+wavelet_matrix = np.empty((len(segments), len(SCALES)), dtype=np.float32)
+stale = []
+hashed = 0
+
+for i, seg in enumerate(segments):
+    source = segment_source(seg)   # WAV or virtual song slice
+
+    # unchanged source (path, mtime, size) -> known content key, no decode
+    signature = source_signature(source) if INCREMENTAL else None
+    key = lookup_source(signature) if signature else None
+
+    if key is None:
+        key = segment_key(read_source(source, TARGET_SR))
+        hashed += 1
+        if signature:
+            remember_source(signature, key)
+    seg.content_hash = key
+
+    spec = load_field(key, "spectrogram") if INCREMENTAL else None
+    energy = load_field(key, "wavelet_energy") if INCREMENTAL else None
+
+    if spec is None or energy is None:
+        stale.append(i)
+    else:
+        seg.spectrogram = spec
+        wavelet_matrix[i] = energy
+
+print(f"[INFO] {hashed} sources hashed, {len(segments) - len(stale)} segments cached, "
+      f"{len(stale)} to featurize")
+
+
 # -----------------------------
 # SONG-LEVEL KEY ASSIGNMENT
 # -----------------------------
+# ingest.py estimates keys while each song is decoded; otherwise the
+# chroma summary comes from key_estimation's per-song cache
 for song_name, song_segments in segments_by_song.items():
-    print(f"[PROCESS] Estimating key for song: {song_name}")
+    keys = {seg.key for seg in song_segments}
 
-    y = np.load(f"{RAW_SONGS_DIR}/{song_name}.npy")
+    if len(keys) == 1 and None not in keys:
+        key = keys.pop()
+        print(f"[INFO] Key for {song_name} (already in DB): {key}")
+    else:
+        print(f"[PROCESS] Estimating key for song: {song_name}")
 
-    chroma = librosa.feature.chroma_cqt(y=y, sr=TARGET_SR)
-    song_key = estimate_key(chroma)
+        y = np.load(f"{RAW_SONGS_DIR}/{song_name}.npy", mmap_mode="r")
+        key = song_key(y, TARGET_SR)
 
-    for seg in song_segments:
-        seg.key = song_key
+        print(f"  → Assigned key: {key}")
 
-    print(f"  → Assigned key: {song_key}")
+    for seg in song_segments:
+        seg.key = key
 
 
 # -----------------------------
-# STFT ATTACHMENT + WAVELETS
+# STFT ATTACHMENT + WAVELETS (NEW / CHANGED SEGMENTS ONLY)
 # -----------------------------
-SCALES = [1, 2, 4, 8]
-WAVELET = "morl"
+# bounded batches: at most FEATURIZE_BATCH decoded segments and
+# spectrograms in memory; results are read back memory-mapped
+for b0 in range(0, len(stale), FEATURIZE_BATCH):
+    batch = stale[b0:b0 + FEATURIZE_BATCH]
+    audios = [read_source(segment_source(segments[i]), TARGET_SR) for i in batch]
 
-for seg in segments:
-    # -------- FIX: ensure spectrogram exists --------
-    if seg.spectrogram is None:
-        audio, sr = sf.read(seg.wav_path)
-        if sr != TARGET_SR:
-            raise ValueError(f"SR mismatch in {seg.wav_path}")
-        seg.spectrogram = extract_normalized_spectrogram(audio)
+    specs = extract_normalized_spectrograms(audios)                       # batched STFT
+    energies = wavelet_energies(envelopes(specs), SCALES, WAVELET)         # one FFT pass
 
-    mag = seg.spectrogram              # (1025, 128)
-    env = np.mean(mag, axis=0)         # (128,)
+    for i, spec, energy in zip(batch, specs, energies):
+        key = segments[i].content_hash
+        save_fields(key, spectrogram=spec, wavelet_energy=energy)
+        segments[i].spectrogram = load_field(key, "spectrogram")
+        wavelet_matrix[i] = energy
 
-    coeffs, freqs = pywt.cwt(
-        env,
-        scales=SCALES,
-        wavelet=WAVELET
-    )
+    print(f"[INFO] Featurized {min(b0 + FEATURIZE_BATCH, len(stale))}/{len(stale)} segments")
 
-    seg.wavelet_energy = np.mean(np.abs(coeffs), axis=1)
+if stale:
+    print(f"[INFO] Computed {len(stale)} spectrograms + wavelet energies")
+print(f"[INFO] Wavelet energy ({WAVELET}, scales {list(SCALES)}): {wavelet_matrix.shape}")
 
 
 # -----------------------------
@@ -113,12 +144,12 @@ for seg in segments:
     assert seg.spectrogram.shape == ref_shape, \
         f"Spectrogram shape mismatch in {seg.id}"
 
-    assert seg.wavelet_energy is not None, \
-        f"Missing wavelet features in {seg.id}"
-
     assert seg.key is not None, \
         f"Missing key in {seg.id}"
 
+assert wavelet_matrix.shape == (N, len(SCALES)), "Wavelet energy matrix shape mismatch!"
+assert np.all(np.isfinite(wavelet_matrix)), "Non-finite wavelet energy!"
+
 print("[SUCCESS] All sanity checks passed!")
 print(f"Total segments: {N}")
 print(f"Spectrogram shape: {ref_shape}")
@@ -127,8 +158,8 @@ print(f"Spectrogram shape: {ref_shape}")
 # -----------------------------
 # SAVE UPDATED DB
 # -----------------------------
-with open(MASTER_DB_PATH, "wb") as f:
-    pickle.dump(segments, f)
+# wavelet energy goes straight in as a column
+save_segments(segments, MASTER_DB_PATH, arrays={"wavelet_energy": wavelet_matrix})
 
 print("[DONE] Day 6 features added and DB updated.")
 
@@ -141,7 +172,7 @@ s = segments[0]
 print("ID:", s.id)
 print("Key:", s.key)
 print("Spectrogram shape:", s.spectrogram.shape)
-print("Wavelet energy:", s.wavelet_energy)
-print("Wavelet shape:", s.wavelet_energy.shape)
+print("Wavelet energy:", wavelet_matrix[0])
+print("Wavelet shape:", wavelet_matrix[0].shape)
 
 
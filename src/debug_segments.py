@@ -1,7 +1,7 @@
-import pickle
+from feature_store import load_segments
 
-db = pickle.load(open("database/master_db.pkl", "rb"))
-seg = db[0]
+db = load_segments("database/master_db")
+seg = db[0].materialize()   # plain Segment, all columns loaded
 
 print("Segment object type:", type(seg))
 print("\nAvailable attributes:\n", seg.__dict__)   # VERY IMPORTANT
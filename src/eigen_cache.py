@@ -0,0 +1,179 @@
+# src/eigen_cache.py
+"""
+Persistent eigendecomposition cache for graph Hamiltonians.
+
+Entries are keyed by a content hash of
+    (adjacency, Hamiltonian type, lambda_bio, bio operator seed)
+so a decomposition always links back to the exact graph it came from.
+
+Layout (one directory per key):
+    database/eigen_cache/<key>/eigvals.npy
+    database/eigen_cache/<key>/eigvecs.npy   (loaded memory-mapped)
+    database/eigen_cache/<key>/meta.json
+
+Both the in-process table and the on-disk store are LRU-bounded.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+from ctqw_engine import diagonalize
+from hamiltonian_ops import build_hamiltonian, BIO_SEED
+
+CACHE_DIR = "database/eigen_cache"
+
+MEMORY_MAX_ENTRIES = 8
+DISK_MAX_ENTRIES = 32
+
+_memory = OrderedDict()
+
+
+# ======================================
+# KEYS
+# ======================================
+def cache_key(A,
+              kind: str = "laplacian",
+              lambda_bio: float = 0.0,
+              bio_seed: int = BIO_SEED) -> str:
+    """
+    Content hash of the adjacency plus the Hamiltonian recipe.
+
+    The adjacency is hashed in canonical CSR form, so the dense and
+    sparse copies of one graph share a key.
+    """
+    A = sp.csr_matrix(A, dtype=float, copy=True)
+    A.sum_duplicates()
+    A.eliminate_zeros()
+    A.sort_indices()
+
+    # the seed is irrelevant when the bio term is switched off
+    seed = bio_seed if lambda_bio != 0 else None
+
+    h = hashlib.sha256()
+    h.update(f"{A.shape}|{kind}|{float(lambda_bio)!r}|{seed}".encode())
+    h.update(A.indptr.astype(np.int64).tobytes())
+    h.update(A.indices.astype(np.int64).tobytes())
+    h.update(A.data.tobytes())
+    return h.hexdigest()[:32]
+
+
+# ======================================
+# DISK STORE
+# ======================================
+def _entry_dir(key, cache_dir):
+    return os.path.join(cache_dir, key)
+
+
+def _load_entry(key, cache_dir):
+    path = _entry_dir(key, cache_dir)
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        return None
+
+    eigvals = np.load(os.path.join(path, "eigvals.npy"))
+    eigvecs = np.load(os.path.join(path, "eigvecs.npy"), mmap_mode="r")
+
+    # mark as recently used for disk LRU
+    os.utime(path)
+    return eigvals, eigvecs
+
+
+def _save_entry(key, cache_dir, eigvals, eigvecs, meta):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # write into a scratch dir first so readers never see a partial entry
+    tmp = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp_")
+    np.save(os.path.join(tmp, "eigvals.npy"), eigvals)
+    np.save(os.path.join(tmp, "eigvecs.npy"), eigvecs)
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    try:
+        os.rename(tmp, _entry_dir(key, cache_dir))
+    except OSError:
+        # another process stored the same key first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def evict_disk(cache_dir: str = CACHE_DIR, max_entries: int = DISK_MAX_ENTRIES):
+    """
+    Trim the disk store to the max_entries most recently used entries.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = [
+        os.path.join(cache_dir, d)
+        for d in os.listdir(cache_dir)
+        if not d.startswith(".")
+    ]
+    if len(entries) <= max_entries:
+        return
+
+    entries.sort(key=os.path.getmtime)
+    for path in entries[:len(entries) - max_entries]:
+        shutil.rmtree(path, ignore_errors=True)
+        print(f"[CACHE] Evicted {os.path.basename(path)}")
+
+
+# ======================================
+# PUBLIC API
+# ======================================
+def load_or_compute(A,
+                    kind: str = "laplacian",
+                    lambda_bio: float = 0.0,
+                    bio_seed: int = BIO_SEED,
+                    cache_dir: str = CACHE_DIR,
+                    evict: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (eigvals, eigvecs) of build_hamiltonian(A, kind, lambda_bio, bio_seed).
+
+    Lookup order: in-process LRU -> disk (memory-mapped) -> eigh.
+    evict=False skips the disk LRU trim after a miss, so a batch of
+    entries that must all stay on disk (ctqw_sweep) can be stored
+    before calling evict_disk() once at the end.
+    """
+    key = cache_key(A, kind, lambda_bio, bio_seed)
+
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+
+    result = _load_entry(key, cache_dir)
+
+    if result is None:
+        print(f"[CACHE] Miss {key} ({kind}, lambda_bio={lambda_bio}) — diagonalizing")
+        H = build_hamiltonian(A, kind, lambda_bio, bio_seed)
+        eigvals, eigvecs = diagonalize(H)
+
+        meta = {
+            "key": key,
+            "kind": kind,
+            "lambda_bio": float(lambda_bio),
+            "bio_seed": bio_seed if lambda_bio != 0 else None,
+            "num_nodes": int(A.shape[0]),
+        }
+        _save_entry(key, cache_dir, eigvals, eigvecs, meta)
+        if evict:
+            evict_disk(cache_dir, DISK_MAX_ENTRIES)
+
+        result = _load_entry(key, cache_dir) or (eigvals, eigvecs)
+
+    _memory[key] = result
+    while len(_memory) > MEMORY_MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+    return result
+
+
+def clear_memory():
+    """
+    Drop the in-process table (disk entries are kept).
+    """
+    _memory.clear()
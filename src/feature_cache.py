@@ -0,0 +1,151 @@
+# src/feature_cache.py
+"""
+Persistent per-segment feature cache for incremental featurization.
+
+Entries are keyed by a content hash of
+    (segment audio, frozen feature parameters from feature_contract.py,
+     spectrogram frame cap, wavelet scales)
+so a cached spectrogram / wavelet energy / mel vector is reused only
+for byte-identical audio under the exact same recipe. Adding a song to
+a large catalogue then only featurizes that song's segments.
+
+Hashing needs the decoded audio, so each segment's source is also
+fingerprinted cheaply (path, mtime, size, and the sample range for
+song slices) and mapped to its content key. An unchanged source skips
+decoding and hashing; only a new or touched file is read.
+
+Layout (one directory per key, one .npy per field):
+    database/feature_cache/<key>/spectrogram.npy      (loaded memory-mapped)
+    database/feature_cache/<key>/wavelet_energy.npy
+    database/feature_cache/<key>/features.npy         raw mel vector
+    database/feature_cache/sources/<source hash>.txt  content key of a source
+
+Fields are written independently (day6_features fills the first ones,
+w2d1 adds features later).
+"""
+
+import os
+import hashlib
+import tempfile
+
+import numpy as np
+
+from feature_contract import SAMPLING_RATE, N_FFT, HOP_LENGTH, N_MELS
+from spectral import MAX_FRAMES
+from wavelet_energy import SCALES, WAVELET
+from slicing import RAW_SONGS_DIR
+
+CACHE_DIR = "database/feature_cache"
+SOURCES_DIR = "sources"
+
+RECIPE = (
+    f"sr={SAMPLING_RATE}|n_fft={N_FFT}|hop={HOP_LENGTH}|n_mels={N_MELS}"
+    f"|frames={MAX_FRAMES}|wavelet={WAVELET}{list(SCALES)}"
+)
+
+
+# ======================================
+# KEYS
+# ======================================
+def segment_key(audio: np.ndarray) -> str:
+    """
+    Content hash of one segment's audio plus the feature recipe.
+    """
+    audio = np.ascontiguousarray(audio)
+
+    h = hashlib.sha256()
+    h.update(f"{audio.dtype}|{audio.shape}|{RECIPE}".encode())
+    h.update(audio.tobytes())
+    return h.hexdigest()[:32]
+
+
+def source_signature(source):
+    """
+    Cheap fingerprint of a segment source (see virtual_segments.segment_source)
+    from file metadata only, or None if the file is missing.
+    """
+    if isinstance(source, tuple):
+        song, start, end = source
+        path, extra = os.path.join(RAW_SONGS_DIR, song + ".npy"), f"|{start}|{end}"
+    else:
+        path, extra = source, ""
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}{extra}|{RECIPE}"
+
+
+# ======================================
+# DISK STORE
+# ======================================
+def _field_path(key, name, cache_dir):
+    return os.path.join(cache_dir, key, name + ".npy")
+
+
+def load_field(key: str, name: str, cache_dir: str = CACHE_DIR):
+    """
+    Cached field for one segment, or None. Spectrograms come back memory-mapped.
+    """
+    path = _field_path(key, name, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    value = np.load(path, mmap_mode="r" if name == "spectrogram" else None)
+    return str(value) if value.dtype.kind == "U" else value
+
+
+def save_fields(key: str, cache_dir: str = CACHE_DIR, **fields):
+    """
+    Store (or overwrite) some fields of one entry.
+    """
+    entry = os.path.join(cache_dir, key)
+    os.makedirs(entry, exist_ok=True)
+
+    for name, value in fields.items():
+        # write a scratch file first so readers never see a partial field
+        fd, tmp = tempfile.mkstemp(dir=entry, prefix=".tmp_", suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.asarray(value))
+        os.replace(tmp, _field_path(key, name, cache_dir))
+
+
+def _source_path(signature, cache_dir):
+    name = hashlib.sha256(signature.encode()).hexdigest()[:32]
+    return os.path.join(cache_dir, SOURCES_DIR, name + ".txt")
+
+
+def lookup_source(signature: str, cache_dir: str = CACHE_DIR):
+    """
+    Content key last computed for this source signature, or None.
+    """
+    path = _source_path(signature, cache_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip() or None
+
+
+def remember_source(signature: str, key: str, cache_dir: str = CACHE_DIR):
+    path = _source_path(signature, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_", suffix=".txt")
+    with os.fdopen(fd, "w") as f:
+        f.write(key)
+    os.replace(tmp, path)
+
+
+def split_cached(keys, name: str, cache_dir: str = CACHE_DIR) -> tuple[dict, list]:
+    """
+    ({row: cached value}, [rows to recompute]) for one field over many keys.
+    """
+    hits, misses = {}, []
+    for row, key in enumerate(keys):
+        value = load_field(key, name, cache_dir)
+        if value is None:
+            misses.append(row)
+        else:
+            hits[row] = value
+    return hits, misses
@@ -0,0 +1,249 @@
+# src/feature_store.py
+"""
+Columnar, memory-mapped segment store (replaces the master_db*.pkl lists).
+
+One directory per DB, one .npy per column:
+    database/<db>/features.npy        (N, 40)
+    database/<db>/spectrogram.npy     (N, 1025, 128)
+    database/<db>/wavelet_energy.npy  (N, 4)
+    database/<db>/id.npy, parent_song.npy, start.npy, end.npy, key.npy,
+                  wav_path.npy, ...   metadata columns
+    database/<db>/meta.json           written last; marks a complete store
+
+Columns are memory-mapped the first time they are read, so a stage that
+only needs ids and features never touches the spectrograms.
+
+load_segments() returns SegmentView objects that behave like Segment:
+attributes read straight from the columns, and assigning an attribute
+(seg.features = ...) overrides it on that view only. save_segments()
+accepts Segments and views alike.
+"""
+
+import os
+import json
+
+import numpy as np
+
+# per-segment arrays, stacked along axis 0
+ARRAY_COLUMNS = ("features", "spectrogram", "wavelet_energy")
+
+# scalar metadata: column -> dtype (None is stored as "", -1 or NaN)
+META_COLUMNS = {
+    "id": str,
+    "parent_song": str,
+    "start": np.float64,
+    "end": np.float64,
+    "key": str,
+    "wav_path": str,
+    "slice_name": str,
+    "global_index": np.int64,
+    "start_sample": np.int64,
+    "end_sample": np.int64,
+    "content_hash": str,
+}
+
+META_FILE = "meta.json"
+
+
+def store_exists(path: str) -> bool:
+    return os.path.exists(os.path.join(path, META_FILE))
+
+
+def _column_path(path, name):
+    return os.path.join(path, name + ".npy")
+
+
+def _encode(values, dtype):
+    if dtype is str:
+        return np.array(["" if v is None else str(v) for v in values], dtype=str)
+    if dtype is np.int64:
+        return np.array([-1 if v is None else v for v in values], dtype=np.int64)
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _decode(value, dtype):
+    if dtype is str:
+        return str(value) or None
+    if dtype is np.int64:
+        return None if value < 0 else int(value)
+    return None if np.isnan(value) else float(value)
+
+
+# ======================================
+# READER
+# ======================================
+class FeatureStore:
+    """
+    Read-only columnar store; columns are memory-mapped on first use.
+    """
+
+    def __init__(self, path: str):
+        if not store_exists(path):
+            raise FileNotFoundError(f"No feature store at {path}")
+
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.columns = tuple(meta["columns"])
+        self._n = int(meta["num_segments"])
+        self._mapped = {}
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, row: int) -> "SegmentView":
+        if not 0 <= row < self._n:
+            raise IndexError(row)
+        return SegmentView(self, row)
+
+    def __iter__(self):
+        return (SegmentView(self, r) for r in range(self._n))
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Whole column, memory-mapped (arrays) or loaded once (metadata).
+        """
+        if name not in self._mapped:
+            if name not in self.columns:
+                raise KeyError(f"Column {name!r} not in {self.path}")
+            self._mapped[name] = np.load(_column_path(self.path, name), mmap_mode="r")
+        return self._mapped[name]
+
+    def value(self, name: str, row: int):
+        if name not in self.columns:
+            return None
+        if name in META_COLUMNS:
+            return _decode(self.column(name)[row], META_COLUMNS[name])
+        return self.column(name)[row]
+
+
+class SegmentView:
+    """
+    Lazy, Segment-compatible view of one row of a FeatureStore.
+    """
+
+    def __init__(self, store: FeatureStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __getattr__(self, name):
+        # only reached when the attribute was not assigned on this view
+        if name.startswith("_") or (name not in ARRAY_COLUMNS and name not in META_COLUMNS):
+            raise AttributeError(name)
+        return self._store.value(name, self._row)
+
+    def materialize(self):
+        """
+        Plain Segment with every column (and override) copied in.
+        """
+        from segment import Segment
+
+        seg = Segment(self.id, self.parent_song, self.start, self.end)
+        for name in (*ARRAY_COLUMNS, *META_COLUMNS):
+            value = getattr(self, name)
+            setattr(seg, name, np.array(value) if isinstance(value, np.ndarray) else value)
+        return seg
+
+    def __repr__(self):
+        return f"<Segment {self.id} | {self.parent_song} | {self.start}-{self.end}s>"
+
+
+def load_segments(path: str) -> list:
+    """
+    SegmentViews for every row, in stored order.
+    """
+    return list(FeatureStore(path))
+
+
+# ======================================
+# WRITER
+# ======================================
+def _write_stacked_column(path, name, array, n):
+    array = np.asarray(array)
+    if len(array) != n:
+        raise ValueError(f"Column {name} has {len(array)} rows, expected {n}")
+
+    tmp = _column_path(path, ".tmp_" + name)
+    np.save(tmp, array)
+    os.replace(tmp, _column_path(path, name))
+    return True
+
+
+def _write_array_column(path, name, segments):
+    values = [getattr(seg, name, None) for seg in segments]
+    present = [v for v in values if v is not None]
+    if not present:
+        return False
+
+    ref = np.asarray(present[0])
+    tmp = _column_path(path, ".tmp_" + name)
+    out = np.lib.format.open_memmap(
+        tmp, mode="w+", dtype=ref.dtype, shape=(len(segments),) + ref.shape
+    )
+    for i, (seg, v) in enumerate(zip(segments, values)):
+        if v is None:
+            raise ValueError(f"Missing {name} in segment {seg.id}")
+        v = np.asarray(v)
+        if v.shape != ref.shape:
+            raise ValueError(f"{name} shape mismatch in {seg.id}: {v.shape} vs {ref.shape}")
+        out[i] = v
+    out.flush()
+    del out
+
+    os.replace(tmp, _column_path(path, name))
+    return True
+
+
+def _write_meta_column(path, name, segments):
+    values = [getattr(seg, name, None) for seg in segments]
+    if all(v is None for v in values):
+        return False
+
+    tmp = _column_path(path, ".tmp_" + name)
+    np.save(tmp, _encode(values, META_COLUMNS[name]))
+    os.replace(tmp, _column_path(path, name))
+    return True
+
+
+def save_segments(segments, path: str, columns=None, arrays=None):
+    """
+    Write Segments (or SegmentViews) as a columnar store at path.
+
+    columns restricts which columns are written (default: all). arrays
+    maps array column names to already-stacked (N, ...) matrices, which
+    are written as-is instead of gathering per-segment attributes.
+    Columns that are None on every segment are left out. Each column is
+    written to a temp file and swapped in, so overwriting the store a
+    view was loaded from is safe.
+    """
+    wanted = set(columns) if columns is not None else set(ARRAY_COLUMNS) | set(META_COLUMNS)
+    arrays = arrays or {}
+
+    os.makedirs(path, exist_ok=True)
+
+    # an interrupted write leaves no meta.json, i.e. no readable store
+    meta_path = os.path.join(path, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    columns = [
+        name for name in META_COLUMNS
+        if name in wanted and _write_meta_column(path, name, segments)
+    ]
+    columns += [
+        name for name in ARRAY_COLUMNS
+        if name in wanted and (
+            _write_stacked_column(path, name, arrays[name], len(segments))
+            if name in arrays else _write_array_column(path, name, segments)
+        )
+    ]
+
+    for name in (*ARRAY_COLUMNS, *META_COLUMNS):
+        if name not in columns and os.path.exists(_column_path(path, name)):
+            os.remove(_column_path(path, name))
+
+    with open(meta_path, "w") as f:
+        json.dump({"num_segments": len(segments), "columns": columns}, f, indent=2)
+
+    print(f"[STORE] {len(segments)} segments ({', '.join(columns)}) → {path}")
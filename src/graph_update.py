@@ -0,0 +1,192 @@
+# src/graph_update.py
+"""
+Incremental kNN graph maintenance when segments are appended.
+
+The raw kNN graph keeps, per row, the K best compatibility scores
+(self excluded); A_sym = max(A_raw, A_raw.T); H_L = D - A_sym.
+
+For M new segments appended after N_old existing ones, only the
+(M, N) block of compatibility scores is computed, in row blocks:
+    - new rows pick their top-K over the whole catalogue,
+    - old rows whose K-th best score is beaten by the block merge the
+      block's top-K into their current top-K, so an old segment whose
+      neighbourhood is beaten by a new one is updated too (reverse edges),
+which gives the same raw graph a full rebuild would, at O(M × N).
+
+Symmetrization is O(nnz); the degree vector is patched only on the
+rows whose edges changed, and the isolation / self-loop / symmetry
+checks run on those rows only.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from scoring import compatibility_scores, SIMILARITY_BLOCK_ROWS
+from sparse_graph import symmetrize_max
+from graph_validation import MAX_DENSITY, SYMMETRY_TOL
+
+
+def _row_topk(A: sp.csr_matrix, K: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    CSR rows -> (idx, score) (n, K) arrays, padded with -1 / -inf.
+    """
+    n = A.shape[0]
+    counts = np.diff(A.indptr)
+    pos = np.arange(A.nnz) - np.repeat(A.indptr[:-1], counts)
+    row = np.repeat(np.arange(n), counts)
+    keep = pos < K
+
+    idx = np.full((n, K), -1, dtype=np.int64)
+    score = np.full((n, K), -np.inf, dtype=np.float32)
+    idx[row[keep], pos[keep]] = A.indices[keep]
+    score[row[keep], pos[keep]] = A.data[keep]
+    return idx, score
+
+
+def _topk_to_csr(idx, score, N):
+    found = np.isfinite(score)
+    rows = np.broadcast_to(np.arange(len(idx))[:, None], idx.shape)[found]
+    A = sp.csr_matrix((score[found].astype(float), (rows, idx[found])), shape=(N, N))
+    A.sort_indices()
+    return A
+
+
+def extend_knn(A_raw: sp.spmatrix, X: np.ndarray, codes: np.ndarray, K: int,
+               block_rows: int = SIMILARITY_BLOCK_ROWS) -> tuple[sp.csr_matrix, np.ndarray]:
+    """
+    Raw kNN adjacency of N_old segments -> that of all len(X) segments.
+
+    X / codes cover ALL segments (old first, new appended). Returns the
+    new (N, N) raw adjacency and the old rows whose neighbours changed.
+    """
+    A_raw = sp.csr_matrix(A_raw)
+    n_old, N = A_raw.shape[0], len(X)
+    X = np.asarray(X, dtype=np.float32)
+
+    old_i, old_s = _row_topk(A_raw, K)
+    new_i = np.full((N - n_old, K), -1, dtype=np.int64)
+    new_s = np.full((N - n_old, K), -np.inf, dtype=np.float32)
+
+    for r0 in range(n_old, N, block_rows):
+        r1 = min(r0 + block_rows, N)
+        b = np.arange(r1 - r0)
+
+        S = compatibility_scores(X[r0:r1], codes[r0:r1], X, codes)   # (B, N)
+        S[b, r0 + b] = -np.inf                                       # exclude self
+
+        # new rows: top-K over everything
+        top = np.argpartition(S, -K, axis=1)[:, -K:]
+        new_i[r0 - n_old:r1 - n_old] = top
+        new_s[r0 - n_old:r1 - n_old] = np.take_along_axis(S, top, axis=1)
+
+        # old rows: only those whose best new score beats their current
+        # K-th best can change; cut the block to its top-K for those rows
+        # and merge at most 2K candidates
+        St = S[:, :n_old].T                                          # (n_old, B) view
+        hit = np.flatnonzero(St.max(axis=1) > old_s.min(axis=1))
+        if len(hit) == 0:
+            continue
+
+        sub = St[hit]
+        if sub.shape[1] > K:
+            top = np.argpartition(sub, -K, axis=1)[:, -K:]
+        else:
+            top = np.broadcast_to(np.arange(sub.shape[1]), sub.shape)
+        cand_s = np.concatenate([old_s[hit], np.take_along_axis(sub, top, axis=1)], axis=1)
+        cand_i = np.concatenate([old_i[hit], r0 + top], axis=1)
+
+        top = np.argpartition(cand_s, -K, axis=1)[:, -K:]
+        old_s[hit] = np.take_along_axis(cand_s, top, axis=1)
+        old_i[hit] = np.take_along_axis(cand_i, top, axis=1)
+
+    changed = np.flatnonzero((old_i >= n_old).any(axis=1))
+    A_new = _topk_to_csr(np.vstack([old_i, new_i]), np.vstack([old_s, new_s]), N)
+    return A_new, changed
+
+
+def check_rows(A_sym: sp.csr_matrix, rows: np.ndarray, degrees: np.ndarray):
+    """
+    Isolation / self-loop / symmetry checks restricted to `rows`,
+    plus the global density limit (O(1) from nnz).
+    """
+    N = A_sym.shape[0]
+    sub = A_sym[rows]
+
+    if np.any(degrees[rows] <= 0):
+        raise ValueError(f"Isolated nodes detected: {rows[degrees[rows] <= 0]}")
+    if np.any(A_sym.diagonal()[rows] != 0):
+        raise ValueError("Self-loops detected!")
+    if abs(sub - A_sym[:, rows].T).max() > SYMMETRY_TOL:
+        raise ValueError("Graph is not symmetric!")
+    if A_sym.nnz / (N * N) >= MAX_DENSITY:
+        raise ValueError("Graph too dense — quantum walk will be meaningless!")
+
+
+def add_segments(A_raw: sp.spmatrix, degrees: np.ndarray, X: np.ndarray,
+                 codes: np.ndarray, K: int) -> dict:
+    """
+    Grow the graph by the segments appended to X / codes.
+
+    degrees is the old weighted degree vector of A_sym; only touched
+    entries are recomputed. Returns A_raw, A_sym, degrees, H_lap and
+    the touched rows.
+    """
+    A_raw = sp.csr_matrix(A_raw)
+    n_old, N = A_raw.shape[0], len(X)
+    if N <= n_old:
+        raise ValueError(f"No new segments: graph has {n_old} nodes, X has {N} rows")
+
+    A_raw_new, changed = extend_knn(A_raw, X, codes, K)
+    A_sym = symmetrize_max(A_raw_new)
+
+    # rows whose symmetric edges can differ: new rows, changed old rows,
+    # and every endpoint of an edge they gained or lost
+    grown = np.concatenate([changed, np.arange(n_old, N)])
+    touched = np.unique(np.concatenate([
+        grown,
+        A_raw[changed].indices,
+        A_raw_new[grown].indices,
+    ]))
+
+    degrees = np.concatenate([np.asarray(degrees, dtype=float), np.zeros(N - n_old)])
+    degrees[touched] = np.asarray(A_sym[touched].sum(axis=1)).ravel()
+
+    check_rows(A_sym, touched, degrees)
+
+    H_lap = (sp.diags(degrees) - A_sym).tocsr()
+    return {
+        "A_raw": A_raw_new,
+        "A_sym": A_sym,
+        "degrees": degrees,
+        "H_lap": H_lap,
+        "touched": touched,
+    }
+
+
+if __name__ == "__main__":
+    from feature_store import FeatureStore
+    from scoring import song_codes
+    from sparse_graph import load_sparse, save_sparse, degree_vector
+
+    DB_PATH = "database/master_db_features_norm"
+    RAW_PATH = "database/adjacency_raw.npz"
+    SYM_PATH = "database/adjacency_sym.npz"
+    LAP_PATH = "database/H_laplacian.npz"
+    K = 7
+
+    # new segments must be appended (global_index >= current graph size)
+    store = FeatureStore(DB_PATH)
+    X = np.asarray(store.column("features"), dtype=np.float32)
+    codes = song_codes(store.column("parent_song"))
+
+    A_raw = load_sparse(RAW_PATH)
+    degrees = degree_vector(load_sparse(SYM_PATH))
+    print(f"[INFO] Graph: {A_raw.shape[0]} nodes, DB: {len(X)} segments")
+
+    out = add_segments(A_raw, degrees, X, codes, K)
+    print(f"[OK] Added {len(X) - A_raw.shape[0]} segments, {len(out['touched'])} rows touched")
+
+    save_sparse(RAW_PATH, out["A_raw"])
+    save_sparse(SYM_PATH, out["A_sym"])
+    save_sparse(LAP_PATH, out["H_lap"])
+    print(f"[SAVED] {RAW_PATH}, {SYM_PATH}, {LAP_PATH}")
@@ -0,0 +1,106 @@
+# src/graph_validation.py
+"""
+Sparse graph validation — never densifies.
+
+    - symmetry: structural (CSR indptr / indices of A and A.T identical)
+      and by value (data arrays compared element-wise)
+    - self-loops and isolated nodes from the CSR arrays
+    - connected components in one csgraph pass
+    - a compact stats report (degree histogram, component sizes)
+
+Everything is O(nnz) plus O(N).
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+SYMMETRY_TOL = 1e-10
+MAX_DENSITY = 0.2
+TOP_COMPONENTS = 5
+
+
+def _canonical(A) -> sp.csr_matrix:
+    A = sp.csr_matrix(A, copy=True)
+    A.sum_duplicates()
+    A.eliminate_zeros()
+    A.sort_indices()
+    return A
+
+
+def symmetry_error(A) -> float:
+    """
+    max |A_ij - A_ji|, or inf if the sparsity pattern is not symmetric.
+    """
+    A = _canonical(A)
+    T = _canonical(A.T)
+
+    if not (np.array_equal(A.indptr, T.indptr) and np.array_equal(A.indices, T.indices)):
+        return np.inf
+    return float(np.abs(A.data - T.data).max()) if A.nnz else 0.0
+
+
+def graph_report(A) -> dict:
+    """
+    Degree / component statistics of an undirected sparse graph.
+    """
+    A = _canonical(A)
+    N = A.shape[0]
+
+    rows = np.repeat(np.arange(N), np.diff(A.indptr))
+    self_loops = int(np.count_nonzero(rows == A.indices))
+
+    degrees = np.diff(A.indptr)                       # neighbours per node
+    weighted = np.asarray(A.sum(axis=1)).ravel()      # d_i = sum_j A_ij
+
+    n_comp, labels = connected_components(A, directed=False)
+    sizes = np.sort(np.bincount(labels, minlength=n_comp))[::-1]
+
+    return {
+        "num_nodes": N,
+        "nnz": int(A.nnz),
+        "density": A.nnz / (N * N) if N else 0.0,
+        "self_loops": self_loops,
+        "isolated": np.flatnonzero(degrees == 0),
+        "degree_min": int(degrees.min()) if N else 0,
+        "degree_max": int(degrees.max()) if N else 0,
+        "degree_mean": float(degrees.mean()) if N else 0.0,
+        "degree_histogram": np.bincount(degrees),
+        "weighted_degree": weighted,
+        "num_components": int(n_comp),
+        "component_sizes": sizes,
+        "symmetry_error": symmetry_error(A),
+    }
+
+
+def print_report(report: dict):
+    print("[GRAPH STATS]")
+    print(f"  Nodes / edges: {report['num_nodes']} / {report['nnz']}")
+    print(f"  Avg degree: {report['degree_mean']:.2f}")
+    print(f"  Min degree: {report['degree_min']}")
+    print(f"  Max degree: {report['degree_max']}")
+    print(f"  Density: {report['density']:.4f}")
+    hist = report["degree_histogram"]
+    print(f"  Degree histogram: {dict((d, int(c)) for d, c in enumerate(hist) if c)}")
+    sizes = report["component_sizes"]
+    print(f"  Components: {report['num_components']} "
+          f"(largest: {sizes[:TOP_COMPONENTS].tolist()})")
+
+
+def validate_graph(A, max_density: float = MAX_DENSITY, tol: float = SYMMETRY_TOL) -> dict:
+    """
+    Raise ValueError on asymmetry, self-loops, isolated nodes or an
+    over-dense graph; returns the report otherwise.
+    """
+    report = graph_report(A)
+
+    if report["symmetry_error"] > tol:
+        raise ValueError(f"Graph is not symmetric! (max |A - A.T| = {report['symmetry_error']})")
+    if report["self_loops"]:
+        raise ValueError(f"Self-loops detected! ({report['self_loops']})")
+    if len(report["isolated"]):
+        raise ValueError(f"Isolated nodes detected: {report['isolated']}")
+    if report["density"] >= max_density:
+        raise ValueError("Graph too dense — quantum walk will be meaningless!")
+
+    return report
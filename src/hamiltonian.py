@@ -1,47 +1,76 @@
 import numpy as np
+from eigen_cache import load_or_compute, cache_key
+from sparse_graph import load_sparse, save_sparse, degree_vector, laplacian
+from graph_validation import symmetry_error
+from scipy.sparse.csgraph import connected_components
+from spectrum import spectrum_report, spectral_statistics, extreme_gap, EXACT_MAX_N, N_EXTREME
+
+# "exact": full eigh (cached for the CTQW), "partial": Lanczos + SLQ,
+# "auto": exact up to EXACT_MAX_N nodes
+SPECTRUM_MODE = "auto"
 
 # Load adjacency matrix
-A = np.load("database/adjacency_sym.npy")
+A = load_sparse("database/adjacency_sym.npz")
 
 # Basic sanity
 assert A.ndim == 2
 assert A.shape[0] == A.shape[1]
-assert np.allclose(A, A.T, atol=1e-8), "Adjacency not symmetric"
+assert symmetry_error(A) <= 1e-8, "Adjacency not symmetric"
 
 N = A.shape[0]
 print(f"Loaded adjacency matrix of size {N} x {N}")
 
 # Degree matrix
-degrees = A.sum(axis=1)
-D = np.diag(degrees)
+degrees = degree_vector(A)
 
 # Sanity checks
 assert np.all(degrees >= 0), "Negative degree detected"
 H_adj = A.copy()
-H_lap = D - A
+H_lap = laplacian(A)
 # Both must be Hermitian
-assert np.allclose(H_adj, H_adj.T, atol=1e-8)
-assert np.allclose(H_lap, H_lap.T, atol=1e-8)
-# Eigenvalues and eigenvectors
-eigvals_adj, eigvecs_adj = np.linalg.eigh(H_adj)
-eigvals_lap, eigvecs_lap = np.linalg.eigh(H_lap)
-assert np.all(np.isreal(eigvals_adj))
-assert np.all(np.isreal(eigvals_lap))
-spread_adj = eigvals_adj.max() - eigvals_adj.min()
-spread_lap = eigvals_lap.max() - eigvals_lap.min()
-def count_degeneracies(eigvals, tol=1e-6):
-    unique = []
-    for v in eigvals:
-        if not any(abs(v - u) < tol for u in unique):
-            unique.append(v)
-    return len(eigvals) - len(unique)
-
-deg_adj = count_degeneracies(eigvals_adj)
-deg_lap = count_degeneracies(eigvals_lap)
-print("=== Spectrum Summary ===")
-print(f"Adjacency: spread={spread_adj:.4f}, degeneracies={deg_adj}")
-print(f"Laplacian: spread={spread_lap:.4f}, degeneracies={deg_lap}")
-np.save("database/H_adjacency.npy", H_adj)
-np.save("database/H_laplacian.npy", H_lap)
-np.save("database/eigvals_adj.npy", eigvals_adj)
-np.save("database/eigvals_lap.npy", eigvals_lap)
+assert symmetry_error(H_adj) <= 1e-8
+assert symmetry_error(H_lap) <= 1e-8
+exact = SPECTRUM_MODE == "exact" or (SPECTRUM_MODE == "auto" and N <= EXACT_MAX_N)
+if exact:
+    # Eigenvalues and eigenvectors (cached, keyed by adjacency hash)
+    eigvals_adj, eigvecs_adj = load_or_compute(A, "adjacency")
+    eigvals_lap, eigvecs_lap = load_or_compute(A, "laplacian")
+    assert np.all(np.isreal(eigvals_adj))
+    assert np.all(np.isreal(eigvals_lap))
+    report_adj = spectrum_report(H_adj, "exact", eigvals=eigvals_adj)
+    report_lap = spectrum_report(H_lap, "exact", eigvals=eigvals_lap)
+else:
+    # extremes by Lanczos, density by SLQ; no full eigenvalue list
+    report_adj = spectrum_report(H_adj, "partial")
+    report_lap = spectrum_report(H_lap, "partial")
+spread_adj = report_adj["spread"]
+spread_lap = report_lap["spread"]
+print(f"=== Spectrum Summary ({report_lap['mode']}) ===")
+if exact:
+    # sorted, vectorized level statistics (see spectrum.spectral_statistics)
+    stats_adj = spectral_statistics(eigvals_adj, tol=1e-6)
+    stats_lap = spectral_statistics(eigvals_lap, tol=1e-6)
+    deg_adj = stats_adj["degeneracies"]
+    deg_lap = stats_lap["degeneracies"]
+    print(f"Adjacency: spread={spread_adj:.4f}, degeneracies={deg_adj}, "
+          f"gap={stats_adj['top_gap']:.4f}")
+    print(f"Laplacian: spread={spread_lap:.4f}, degeneracies={deg_lap}, "
+          f"gap={stats_lap['spectral_gap']:.4f}, "
+          f"largest multiplicity={int(stats_lap['clusters'][:, 1].max()) if len(stats_lap['clusters']) else 1}")
+else:
+    # only what was computed: Lanczos extremes, spread, SLQ density.
+    # H_A gap between its top two levels; H_L gap above its zero level,
+    # whose multiplicity is the number of connected components
+    n_comp, _ = connected_components(A, directed=False)
+    gap_adj = extreme_gap(H_adj, "top", report_adj["highest"])
+    gap_lap = extreme_gap(H_lap, "bottom", report_lap["lowest"], k=max(N_EXTREME, n_comp + 1))
+    for name, report, spread, gap in (("Adjacency", report_adj, spread_adj, gap_adj),
+                                      ("Laplacian", report_lap, spread_lap, gap_lap)):
+        print(f"{name}: spread={spread:.4f}, degeneracies=n/a (partial), gap={gap:.4f}")
+        print(f"  lowest:  {np.round(report['lowest'], 4)}")
+        print(f"  highest: {np.round(report['highest'], 4)}")
+save_sparse("database/H_adjacency.npz", H_adj)
+save_sparse("database/H_laplacian.npz", H_lap)
+if exact:
+    print(f"Eigendecompositions cached: adjacency={cache_key(A, 'adjacency')}, "
+          f"laplacian={cache_key(A, 'laplacian')}")
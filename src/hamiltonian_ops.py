@@ -0,0 +1,92 @@
+# src/hamiltonian_ops.py
+"""
+Hamiltonian construction from the symmetric similarity graph.
+
+Shared by app.py, hamiltonian.py and the eigen cache so that every
+stage builds H from the adjacency in exactly the same way.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from sparse_graph import degree_vector, laplacian
+
+HAMILTONIAN_TYPES = ("laplacian", "adjacency")
+BIO_SEED = 42
+
+
+# ======================================
+# BIO OPERATOR
+# ======================================
+def bio_potential(N: int, seed: int = BIO_SEED) -> np.ndarray:
+    """
+    Diagonal of the toy bio operator: unit-norm Gaussian on-site energies.
+    """
+    rng = np.random.default_rng(seed)
+    v = rng.normal(0, 1, N)
+    v /= np.linalg.norm(v) + 1e-12
+    return v
+
+
+# ======================================
+# HAMILTONIANS
+# ======================================
+def build_hamiltonian(A,
+                      kind: str = "laplacian",
+                      lambda_bio: float = 0.0,
+                      bio_seed: int = BIO_SEED) -> sp.csr_matrix:
+    """
+    A (N, N), dense or sparse -> H (N, N) sparse CSR
+
+    kind="laplacian": H = D - A
+    kind="adjacency": H = A
+    plus lambda_bio * diag(bio_potential) when lambda_bio != 0.
+    """
+    if kind not in HAMILTONIAN_TYPES:
+        raise ValueError(f"Unknown Hamiltonian type {kind!r}, expected one of {HAMILTONIAN_TYPES}")
+
+    A = sp.csr_matrix(A, dtype=float)
+
+    if kind == "laplacian":
+        H = laplacian(A)
+    else:
+        H = A.copy()
+
+    if lambda_bio != 0:
+        H = (H + lambda_bio * sp.diags(bio_potential(A.shape[0], bio_seed))).tocsr()
+
+    return H
+
+
+def hamiltonian_diagonal(A,
+                         kind: str = "laplacian",
+                         lambda_bio: float = 0.0,
+                         bio_seed: int = BIO_SEED) -> np.ndarray:
+    """
+    diag(H) without assembling H.
+    """
+    A = sp.csr_matrix(A, dtype=float)
+
+    diag = A.diagonal()
+    if kind == "laplacian":
+        diag = degree_vector(A) - diag
+
+    if lambda_bio != 0:
+        diag = diag + lambda_bio * bio_potential(A.shape[0], bio_seed)
+
+    return diag
+
+
+def noise_distribution(A,
+                       kind: str = "laplacian",
+                       lambda_bio: float = 0.0,
+                       bio_seed: int = BIO_SEED) -> np.ndarray:
+    """
+    ENAQT noise vector eta ∝ sum_j |H_ij|, computed from A directly.
+    """
+    A = sp.csr_matrix(A, dtype=float)
+
+    off_diag = degree_vector(abs(A)) - np.abs(A.diagonal())
+
+    deg = np.abs(hamiltonian_diagonal(A, kind, lambda_bio, bio_seed)) + off_diag
+    return deg / (deg.sum() + 1e-12)
@@ -0,0 +1,102 @@
+# src/ingest.py
+"""
+Parallel ingestion: raw .wav songs -> master DB in one command.
+
+Each song is independent up to the DB, so songs are fanned out to a
+process pool and every worker runs the whole per-song chain once:
+    decode -> normalize (.npy) -> beat track -> bar grid -> key -> slice
+
+The parent then merges the results in SORTED song order, so song ids
+(S01, S02, ...) and global_index come out exactly as a serial
+build_segments.py run would number them, however the pool schedules work.
+
+The slicing mode follows slicing.py:
+    default            workers write per-bar WAVs
+    PACK_AUDIO_BANK    parent packs one audio bank (single writer)
+    VIRTUAL_SEGMENTS   nothing is written; segments are song slices
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_io import list_raw_wavs, process_raw_song, NPY_SONGS_DIR, TARGET_SR
+from slicing import (
+    bar_grid, process_song_segments,
+    PACK_AUDIO_BANK, VIRTUAL_SEGMENTS,
+)
+from bar_interface import bar_dicts
+from audio_bank import AudioBank, AudioBankWriter
+from build_segments import song_segments, write_master_db
+from key_estimation import song_key
+
+# worker processes (None -> os.cpu_count())
+WORKERS = None
+
+
+# ======================================
+# WORKER (ONE SONG)
+# ======================================
+def ingest_song(fname: str, write_wavs: bool = True) -> dict:
+    """
+    decode -> normalize -> beats -> bars (-> WAV slices) for one song.
+    Beat grids and key chroma are cached per song content, so
+    re-ingesting unchanged songs is cheap.
+    """
+    song = os.path.splitext(fname)[0]
+
+    y = process_raw_song(fname)
+    tempo, beat_times, bars = bar_grid(y, TARGET_SR)
+    key = song_key(y, TARGET_SR)
+
+    if write_wavs:
+        process_song_segments(song, bars, y=y)
+
+    return {"song": song, "tempo": tempo, "key": key, "bars": bar_dicts(bars)}
+
+
+# ======================================
+# PIPELINE
+# ======================================
+def ingest_all(workers: int = WORKERS) -> list:
+    """
+    Ingest every .wav in raw_songs and write the master DB.
+    Returns the Segment list (same as build_segments()).
+    """
+    os.makedirs(NPY_SONGS_DIR, exist_ok=True)
+
+    wavs = list_raw_wavs()
+    write_wavs = not (PACK_AUDIO_BANK or VIRTUAL_SEGMENTS)
+    print(f"[INGEST] {len(wavs)} songs, workers={workers or os.cpu_count()}")
+
+    if workers == 1:
+        results = [ingest_song(f, write_wavs) for f in wavs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(ingest_song, wavs, [write_wavs] * len(wavs)))
+
+    # deterministic merge: sorted song order, whatever finished first
+    results.sort(key=lambda r: r["song"])
+
+    bank = None
+    if PACK_AUDIO_BANK:
+        with AudioBankWriter(sr=TARGET_SR) as writer:
+            for r in results:
+                bars = [(b["start"], b["end"]) for b in r["bars"]]
+                process_song_segments(r["song"], bars, bank=writer)
+        bank = AudioBank()
+
+    segment_list = []
+    for song_idx, r in enumerate(results, start=1):
+        if not r["bars"]:
+            print(f"[WARN] No bars detected for {r['song']}; skipped")
+            continue
+        segment_list += song_segments(
+            song_idx, r["song"], r["bars"], len(segment_list), bank, key=r["key"]
+        )
+
+    write_master_db(segment_list, bank)
+    return segment_list
+
+
+if __name__ == "__main__":
+    ingest_all()
@@ -0,0 +1,102 @@
+# src/key_estimation.py
+"""
+Song-level key estimation with a persistent chroma cache.
+
+The key is the strongest pitch class of the song's time-averaged
+chroma. Chroma comes from the pipeline's canonical STFT geometry
+(N_FFT / HOP_LENGTH, see feature_contract.py) instead of a full-length
+CQT, and only the 12-d mean is kept. Summaries are keyed by a content
+hash of (normalized song audio, sr, STFT geometry), so ingest.py
+computes it once while the song is decoded and day6_features.py just
+reads it back.
+
+Layout (one small file per key):
+    database/chroma_cache/<key>.npy   (12,) mean chroma
+"""
+
+import os
+import hashlib
+import tempfile
+
+import numpy as np
+import librosa
+
+from feature_contract import N_FFT, HOP_LENGTH
+
+CACHE_DIR = "database/chroma_cache"
+
+KEYS = ['C','C#','D','D#','E','F','F#','G','G#','A','A#','B']
+
+
+# ======================================
+# KEYS
+# ======================================
+def cache_key(y: np.ndarray, sr: int) -> str:
+    """
+    Content hash of the song audio plus the chroma recipe.
+    """
+    y = np.ascontiguousarray(y)
+
+    h = hashlib.sha256()
+    h.update(f"{y.dtype}|{y.shape}|{sr}|chroma_stft|{N_FFT}|{HOP_LENGTH}".encode())
+    h.update(y.tobytes())
+    return h.hexdigest()[:32]
+
+
+# ======================================
+# CHROMA
+# ======================================
+def mean_chroma(y: np.ndarray, sr: int) -> np.ndarray:
+    """
+    (12,) time-averaged STFT chroma of a whole song.
+    """
+    S = np.abs(librosa.stft(np.asarray(y, dtype=np.float32),
+                            n_fft=N_FFT, hop_length=HOP_LENGTH, center=True)) ** 2
+    chroma = librosa.feature.chroma_stft(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+    return chroma.mean(axis=1)
+
+
+def estimate_key(chroma_mean: np.ndarray) -> str:
+    """
+    Very simple key estimator: the strongest pitch class.
+    """
+    return KEYS[int(np.argmax(chroma_mean))]
+
+
+# ======================================
+# DISK STORE
+# ======================================
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, key + ".npy")
+
+
+def _save_entry(key, cache_dir, chroma_mean):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # write a scratch file first so readers never see a partial entry
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".tmp_", suffix=".npy")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, np.asarray(chroma_mean, dtype=np.float64))
+    os.replace(tmp, _entry_path(key, cache_dir))
+
+
+# ======================================
+# PUBLIC API
+# ======================================
+def load_or_compute_chroma(y: np.ndarray, sr: int, cache_dir: str = CACHE_DIR) -> np.ndarray:
+    """
+    (12,) mean chroma for one song, computed only on a cache miss.
+    """
+    key = cache_key(y, sr)
+
+    path = _entry_path(key, cache_dir)
+    if os.path.exists(path):
+        return np.load(path)
+
+    chroma_mean = mean_chroma(y, sr)
+    _save_entry(key, cache_dir, chroma_mean)
+    return chroma_mean
+
+
+def song_key(y: np.ndarray, sr: int, cache_dir: str = CACHE_DIR) -> str:
+    return estimate_key(load_or_compute_chroma(y, sr, cache_dir))
@@ -0,0 +1,79 @@
+# src/mel_features.py
+"""
+Batched mel feature extraction (see feature_contract.py).
+
+v[m] = mean_t (M @ |X|^2)[m, t] = M @ mean_t |X(f, t)|^2
+
+so every segment's feature is one contraction of its time-averaged
+power spectrum with the SAME 40-band filterbank. The filterbank is
+built once per process and the whole batch goes through one matmul.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import librosa
+
+from feature_contract import SAMPLING_RATE, N_FFT, N_MELS
+
+# spectrograms squared per step (bounds the float64 scratch)
+FEATURE_BATCH = 256
+
+NORM_EPS = 1e-8
+
+
+@lru_cache(maxsize=None)
+def mel_basis(sr: int = SAMPLING_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """
+    (n_mels, n_fft // 2 + 1) filterbank, identical to the one
+    librosa.feature.melspectrogram builds for S=... input.
+    """
+    return librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels).astype(np.float64)
+
+
+def l2_normalize(X: np.ndarray, ids=None, eps: float = NORM_EPS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Row-wise unit norm. Returns (X / ||X||, norms).
+
+    Non-finite or degenerate (< eps) rows raise ValueError; ids (optional)
+    names the offending segment in the message.
+    """
+    norms = np.linalg.norm(X, axis=1)
+
+    for check, what in ((~np.isfinite(norms), "Non-finite norm"),
+                        (norms < eps, "Degenerate feature vector")):
+        bad = np.flatnonzero(check)
+        if len(bad):
+            i = int(bad[0])
+            name = ids[i] if ids is not None else f"row {i}"
+            raise ValueError(f"{what} in segment {name} (norm={norms[i]:.2e})")
+
+    return X / norms[:, None], norms
+
+
+def mel_features(spectrograms, normalize: bool = False, ids=None,
+                 batch_size: int = FEATURE_BATCH) -> np.ndarray:
+    """
+    (N, freq_bins, frames) magnitude spectrograms -> (N, N_MELS) float32
+    mean mel vectors, optionally ℓ2-normalized in the same pass.
+
+    spectrograms may be a stacked (memory-mapped) array or a list of
+    per-segment arrays; they are read batch_size at a time.
+    """
+    n = len(spectrograms)
+    M = mel_basis()
+
+    # mean power spectrum per segment, (N, freq_bins)
+    P = np.empty((n, M.shape[1]), dtype=np.float64)
+    for b0 in range(0, n, batch_size):
+        S = np.asarray(spectrograms[b0:b0 + batch_size], dtype=np.float64)
+        if S.shape[1] != M.shape[1]:
+            raise ValueError(f"Frequency bins mismatch: expected {M.shape[1]}, got {S.shape[1]}")
+        P[b0:b0 + len(S)] = np.square(S).mean(axis=2)
+
+    X = P @ M.T
+
+    if normalize:
+        X, _ = l2_normalize(X, ids)
+
+    return X.astype(np.float32)
@@ -0,0 +1,83 @@
+# src/mix_render.py
+"""
+Single-pass mashup renderer.
+
+Every clip's output offset is computed up front from the clip lengths
+and the crossfade length. The output buffer is allocated ONCE and each
+clip is overlap-added into it in place with linear fades, so rendering
+is linear in mix length (no repeated np.concatenate).
+"""
+
+import numpy as np
+
+
+# ======================================
+# LAYOUT
+# ======================================
+def mix_layout(lengths, crossfade: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    lengths (K,) -> (offsets (K,), overlaps (K,), total_length)
+
+    overlaps[k] is the crossfade between clip k-1 and clip k. Clips
+    shorter than the crossfade are butt-joined (overlap 0).
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+
+    overlaps = np.zeros(len(lengths), dtype=np.int64)
+    if len(lengths) > 1:
+        fits = (lengths[:-1] >= crossfade) & (lengths[1:] >= crossfade)
+        overlaps[1:] = np.where(fits, crossfade, 0)
+
+    offsets = np.zeros(len(lengths), dtype=np.int64)
+    offsets[1:] = np.cumsum(lengths[:-1] - overlaps[1:])
+
+    total = int(offsets[-1] + lengths[-1]) if len(lengths) else 0
+    return offsets, overlaps, total
+
+
+# ======================================
+# RENDER
+# ======================================
+def render_mix(clips, crossfade: int, normalize: bool = False, dtype=np.float32) -> np.ndarray:
+    """
+    Overlap-add mono clips into one buffer with linear crossfades.
+    """
+    lengths = [len(c) for c in clips]
+    offsets, overlaps, total = mix_layout(lengths, crossfade)
+    out = np.zeros(total, dtype=dtype)
+
+    for k, clip in enumerate(clips):
+        n = len(clip)
+        n_in = int(overlaps[k])
+        n_out = int(overlaps[k + 1]) if k + 1 < len(clips) else 0
+        dst = out[offsets[k]:offsets[k] + n]
+
+        if n_in + n_out <= n:
+            dst[n_in:n - n_out] += clip[n_in:n - n_out]
+            if n_in:
+                dst[:n_in] += clip[:n_in] * np.linspace(0, 1, n_in)
+            if n_out:
+                dst[n - n_out:] += clip[n - n_out:] * np.linspace(1, 0, n_out)
+        else:
+            # fade-in and fade-out regions overlap inside a short clip
+            gain = np.ones(n)
+            gain[:n_in] *= np.linspace(0, 1, n_in)
+            gain[n - n_out:] *= np.linspace(1, 0, n_out)
+            dst += clip * gain
+
+    if normalize and total:
+        out /= np.max(np.abs(out)) + 1e-9
+
+    return out
+
+
+def render_path(path, load_clip, crossfade: int, normalize: bool = False, dtype=np.float32) -> np.ndarray:
+    """
+    Render a segment path; `load_clip(key)` is called once per distinct key.
+    """
+    audio = {}
+    for key in path:
+        if key not in audio:
+            audio[key] = load_clip(key)
+
+    return render_mix([audio[key] for key in path], crossfade, normalize, dtype)
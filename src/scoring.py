@@ -13,6 +13,9 @@ import numpy as np
 # =========================
 SAME_SONG_PENALTY = 0.7
 
+# rows of X @ X.T materialized at once by the blocked builder
+SIMILARITY_BLOCK_ROWS = 1024
+
 
 def cosine_similarity(v1: np.ndarray, v2: np.ndarray) -> float:
     """
@@ -34,3 +37,53 @@ def compatibility_score(seg_a, seg_b) -> float:
         score *= SAME_SONG_PENALTY
 
     return score
+
+
+# =========================
+# BATCHED (VECTORIZED) VARIANTS
+# =========================
+def song_codes(parent_songs) -> np.ndarray:
+    """
+    parent_song strings -> int codes (equal song <=> equal code).
+    """
+    _, codes = np.unique(np.asarray(parent_songs, dtype=str), return_inverse=True)
+    return codes.astype(np.int64)
+
+
+def compatibility_scores(X_a: np.ndarray, codes_a: np.ndarray,
+                         X_b: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+    """
+    compatibility_score for every (a, b) pair, as a float32 (n_a, n_b) block.
+    X_* are ℓ2-normalized feature rows, codes_* their song_codes.
+    """
+    S = np.asarray(X_a, dtype=np.float32) @ np.asarray(X_b, dtype=np.float32).T
+    S[codes_a[:, None] == codes_b[None, :]] *= SAME_SONG_PENALTY
+    return S
+
+
+def similarity_blocks(X: np.ndarray, codes: np.ndarray,
+                      block_rows: int = SIMILARITY_BLOCK_ROWS):
+    """
+    Yield (row_start, S[row_start:row_start + block_rows]) of the full
+    compatibility matrix; peak memory is one (block_rows, N) float32 block.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    for r0 in range(0, len(X), block_rows):
+        r1 = min(r0 + block_rows, len(X))
+        yield r0, compatibility_scores(X[r0:r1], codes[r0:r1], X, codes)
+
+
+def compatibility_matrix(X: np.ndarray, codes: np.ndarray, out=None,
+                         block_rows: int = SIMILARITY_BLOCK_ROWS) -> np.ndarray:
+    """
+    Full (N, N) float32 compatibility matrix, built in row blocks.
+    `out` may be a preallocated array or an np.lib.format.open_memmap
+    file, so the matrix never has to fit in memory.
+    """
+    N = len(X)
+    if out is None:
+        out = np.empty((N, N), dtype=np.float32)
+
+    for r0, block in similarity_blocks(X, codes, block_rows):
+        out[r0:r0 + len(block)] = block
+    return out
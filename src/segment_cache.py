@@ -0,0 +1,154 @@
+# src/segment_cache.py
+"""
+Process-wide segment audio cache.
+
+Decoded segment audio is kept as read-only float32 mono arrays keyed
+by segment id. Total size is bounded by a byte budget with LRU
+eviction, so repeated renders do no disk I/O for hot segments.
+
+Audio sources are resolved in order:
+  1. packed audio bank (audio_bank.py): zero-copy memmap views, no LRU
+  2. virtual segments (song, start_sample, end_sample): sliced from the
+     song memmap on read (virtual_segments.py)
+  3. per-segment WAV files
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import soundfile as sf
+
+from audio_bank import AudioBank, bank_exists
+from virtual_segments import read_virtual_segment
+
+TARGET_SR = 22050
+DEFAULT_BUDGET_BYTES = 256 * 1024 ** 2     # 256 MB ≈ 50 min of float32 mono audio
+
+
+def read_segment_audio(wav_path: str, sr: int = TARGET_SR) -> np.ndarray:
+    """
+    Decode one segment WAV as float32 mono at `sr`.
+    """
+    y, file_sr = sf.read(wav_path, dtype="float32")
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+
+    if file_sr != sr:
+        # segments are written at TARGET_SR; only foreign files pay for librosa
+        import librosa
+        y = librosa.resample(y, orig_sr=file_sr, target_sr=sr)
+
+    return np.ascontiguousarray(y, dtype=np.float32)
+
+
+def read_source(source, sr: int = TARGET_SR) -> np.ndarray:
+    """
+    Decode a segment source: a WAV path or (song, start_sample, end_sample).
+    """
+    if isinstance(source, tuple):
+        return read_virtual_segment(*source, sr=sr)
+    return read_segment_audio(source, sr)
+
+
+class SegmentAudioCache:
+    """
+    LRU cache: segment id -> float32 audio, bounded by `budget_bytes`.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES, sr: int = TARGET_SR):
+        self.budget_bytes = budget_bytes
+        self.sr = sr
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bank = None                # optional AudioBank, checked first
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, seg_id):
+        return seg_id in self._items
+
+    def get(self, seg_id, source) -> np.ndarray:
+        """
+        Cached audio for `seg_id`, decoding `source` on a miss
+        (see virtual_segments.segment_source).
+        """
+        if self.bank is not None and seg_id in self.bank:
+            return self.bank.get(seg_id)
+
+        if seg_id in self._items:
+            self._items.move_to_end(seg_id)
+            self.hits += 1
+            return self._items[seg_id]
+
+        self.misses += 1
+        y = read_source(source, self.sr)
+        y.flags.writeable = False       # shared between renders
+        self.put(seg_id, y)
+        return y
+
+    def put(self, seg_id, y: np.ndarray):
+        if y.nbytes > self.budget_bytes:
+            return                      # would evict everything; serve uncached
+
+        if seg_id in self._items:
+            self.nbytes -= self._items.pop(seg_id).nbytes
+
+        self._items[seg_id] = y
+        self.nbytes += y.nbytes
+        self._evict()
+
+    def resize(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.budget_bytes:
+            _, old = self._items.popitem(last=False)
+            self.nbytes -= old.nbytes
+
+    def warm(self, entries):
+        """
+        Preload (seg_id, source) pairs until the budget is full.
+        """
+        for seg_id, source in entries:
+            if self.nbytes >= self.budget_bytes:
+                break
+            if self.bank is not None and seg_id in self.bank:
+                continue
+            self.get(seg_id, source)
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+
+# ======================================
+# PROCESS-WIDE INSTANCE
+# ======================================
+_cache = None
+
+
+def get_cache(budget_bytes: int = None) -> SegmentAudioCache:
+    """
+    The shared cache; `budget_bytes` resizes it if given.
+    """
+    global _cache
+    if _cache is None:
+        _cache = SegmentAudioCache(DEFAULT_BUDGET_BYTES if budget_bytes is None else budget_bytes)
+        if bank_exists():
+            _cache.bank = AudioBank()
+            if _cache.bank.sr != _cache.sr:
+                raise ValueError(f"Audio bank sample rate {_cache.bank.sr} != {_cache.sr}")
+    elif budget_bytes is not None:
+        _cache.resize(budget_bytes)
+    return _cache
+
+
+def load_segment_audio(seg_id, source) -> np.ndarray:
+    """
+    Shortcut for get_cache().get(seg_id, source).
+    """
+    return get_cache().get(seg_id, source)
@@ -1,6 +1,7 @@
 import os
 import numpy as np
 import librosa
+from beat_cache import load_or_track
 
 RAW_SONGS_DIR = "raw_songs"
 TARGET_SR = 22050
@@ -78,19 +79,29 @@ def beats_to_bars(beat_times: np.ndarray,
 
     print(f"[INFO] Created {len(bars)} bars (limited to max {max_bars}).")
     return bars
+def track_bars(y: np.ndarray, sr: int):
+    """
+    Uncached beat tracking + bar grid: (tempo, beat_times, bars).
+    """
+    tempo, beat_times = get_beats(y, sr)
+    return tempo, beat_times, beats_to_bars(beat_times)
+def bar_grid(y: np.ndarray, sr: int):
+    """
+    (tempo, beat_times, bars) for one song's audio, via database/beat_cache.
+    """
+    return load_or_track(y, sr, BEATS_PER_BAR, MAX_BARS_PER_SONG, track_bars)
 def compute_bar_grid_for_song(song_name: str):
     """
     For a given song base name ('song1'), this:
         - loads normalized audio (.npy)
-        - runs beat tracking
+        - runs beat tracking (cached per song content, see beat_cache.py)
         - computes bar intervals with a max limit
     Returns:
         tempo, bars  where bars is a list of (start_time, end_time).
     """
     print(f"\n[PROCESS] Building bar grid for {song_name}")
     y, sr = load_normalized_song(song_name)
-    tempo, beat_times = get_beats(y, sr)
-    bars = beats_to_bars(beat_times)
+    tempo, beat_times, bars = bar_grid(y, sr)
 
     # Debug print first few bars
     for i, (ts, te) in enumerate(bars[:5]):
@@ -128,20 +139,27 @@ def apply_fade(audio, sr, fade_ms=10):
     return audio
 
 import soundfile as sf
+from audio_bank import AudioBankWriter
 
 AUDIO_SEG_DIR = "database/audio_segments"
 
-def slice_and_save_segment(y, sr, start_time, end_time, segment_name):
+# write one packed audio bank instead of one WAV per bar
+PACK_AUDIO_BANK = False
+
+# virtual segments: nothing is written, segments are sliced on read from
+# raw_songs/<song>.npy (see virtual_segments.py / build_segments.py)
+VIRTUAL_SEGMENTS = False
+
+def slice_segment(y, sr, start_time, end_time, segment_name):
     """
-    Slice audio using time boundaries and save as a clean WAV file.
+    Slice audio using time boundaries and apply the anti-click fade.
+    Returns a float32 copy (the song array is never modified).
     """
-    os.makedirs(AUDIO_SEG_DIR, exist_ok=True)
-
     start_sample = int(start_time * sr)
     end_sample = int(end_time * sr)
 
     # Extract raw slice
-    segment_audio = y[start_sample:end_sample]
+    segment_audio = np.array(y[start_sample:end_sample], dtype=np.float32)
 
     # Safety check
     if len(segment_audio) == 0:
@@ -149,7 +167,17 @@ def slice_and_save_segment(y, sr, start_time, end_time, segment_name):
         return None
 
     # Apply fade-in/out
-    segment_audio = apply_fade(segment_audio, sr, fade_ms=10)
+    return apply_fade(segment_audio, sr, fade_ms=10)
+
+def slice_and_save_segment(y, sr, start_time, end_time, segment_name):
+    """
+    Slice audio using time boundaries and save as a clean WAV file.
+    """
+    os.makedirs(AUDIO_SEG_DIR, exist_ok=True)
+
+    segment_audio = slice_segment(y, sr, start_time, end_time, segment_name)
+    if segment_audio is None:
+        return None
 
     # Save WAV
     out_path = os.path.join(AUDIO_SEG_DIR, f"{segment_name}.wav")
@@ -157,21 +185,32 @@ def slice_and_save_segment(y, sr, start_time, end_time, segment_name):
 
     return out_path
 
-def process_song_segments(song_name, bars):
+def process_song_segments(song_name, bars, bank=None, y=None):
     """
     For one song:
-      - loads normalized .npy
+      - loads normalized .npy (unless the audio `y` is passed in)
       - slices each bar into audio files
-      - returns list of segment file paths
+        (or appends it to `bank`, an AudioBankWriter, when given)
+      - returns list of segment file paths (bank: segment names)
     """
     print(f"[PROCESS] Slicing segments for {song_name}")
 
-    y, sr = load_normalized_song(song_name)
+    if y is None:
+        y, sr = load_normalized_song(song_name)
+    else:
+        sr = TARGET_SR
 
     segment_paths = []
     for idx, (start, end) in enumerate(bars):
         seg_name = f"{song_name}_bar_{idx:02d}"
-        out = slice_and_save_segment(y, sr, start, end, seg_name)
+        if bank is not None:
+            audio = slice_segment(y, sr, start, end, seg_name)
+            out = None
+            if audio is not None:
+                bank.add(seg_name, audio)
+                out = seg_name
+        else:
+            out = slice_and_save_segment(y, sr, start, end, seg_name)
         if out:
             segment_paths.append(out)
 
@@ -183,8 +222,17 @@ if __name__ == "__main__":
     song_names = list_song_basenames()
     print("[INFO] Found songs:", song_names)
 
+    if VIRTUAL_SEGMENTS:
+        print("[INFO] VIRTUAL_SEGMENTS is on: nothing to write, run build_segments.py")
+        raise SystemExit(0)
+
+    bank = AudioBankWriter(sr=TARGET_SR) if PACK_AUDIO_BANK else None
+
     for name in song_names:
         tempo, bars = compute_bar_grid_for_song(name)
         #print(f"[SUMMARY] {name}: tempo={tempo:.2f}, bars_kept={len(bars)}")
-        process_song_segments(name, bars)
+        process_song_segments(name, bars, bank=bank)
+
+    if bank is not None:
+        bank.close()
 
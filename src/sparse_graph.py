@@ -0,0 +1,114 @@
+# src/sparse_graph.py
+"""
+Sparse (CSR) segment graph utilities.
+
+The K-nearest-neighbour graph has at most K non-zeros per row, so
+every stage — kNN build, symmetrization, degree/Laplacian assembly,
+serialization and CTQW matvecs — keeps it as scipy.sparse CSR.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from scoring import similarity_blocks, SIMILARITY_BLOCK_ROWS
+
+
+# ======================================
+# KNN CONSTRUCTION
+# ======================================
+def _knn_from_blocks(blocks, N: int, K: int) -> sp.csr_matrix:
+    """
+    (row_start, S[row_start:row_end]) blocks -> raw KNN adjacency.
+    Self is masked in each block and the K best columns are picked with
+    argpartition, so only one block is ever held in memory.
+    """
+    rows = np.repeat(np.arange(N), K)
+    cols = np.empty(N * K, dtype=np.int64)
+    vals = np.empty(N * K, dtype=np.float32)
+
+    for r0, block in blocks:
+        b = np.arange(len(block))
+        scores = block.copy()
+        scores[b, r0 + b] = -np.inf        # exclude self
+
+        idx = np.argpartition(scores, -K, axis=1)[:, -K:]
+        cols[r0 * K:(r0 + len(block)) * K] = idx.ravel()
+        vals[r0 * K:(r0 + len(block)) * K] = block[b[:, None], idx].ravel()
+
+    A_raw = sp.csr_matrix((vals.astype(float), (rows, cols)), shape=(N, N))
+    A_raw.sort_indices()
+    return A_raw
+
+
+def knn_adjacency(S: np.ndarray, K: int,
+                  block_rows: int = SIMILARITY_BLOCK_ROWS) -> sp.csr_matrix:
+    """
+    Similarity S (N, N) -> raw (asymmetric) KNN adjacency.
+
+    Row i keeps S[i, j] for its K best j != i. S may be an np.load
+    memmap; it is read in row blocks and never loaded whole.
+    """
+    N = S.shape[0]
+    blocks = (
+        (r0, np.asarray(S[r0:r0 + block_rows], dtype=np.float32))
+        for r0 in range(0, N, block_rows)
+    )
+    return _knn_from_blocks(blocks, N, K)
+
+
+def knn_adjacency_streaming(X: np.ndarray, codes: np.ndarray, K: int,
+                            block_rows: int = SIMILARITY_BLOCK_ROWS) -> sp.csr_matrix:
+    """
+    Raw KNN adjacency straight from ℓ2-normalized features, same result
+    as knn_adjacency(compatibility matrix, K) without ever building it
+    (row blocks from scoring.similarity_blocks, same-song penalty included).
+    """
+    return _knn_from_blocks(similarity_blocks(X, codes, block_rows), len(X), K)
+
+
+def symmetrize_max(A_raw: sp.spmatrix) -> sp.csr_matrix:
+    """
+    A_sym[i, j] = max(A_ij, A_ji), self-loops removed.
+    """
+    A_sym = A_raw.maximum(A_raw.T).tocsr()
+    A_sym.setdiag(0.0)
+    A_sym.eliminate_zeros()
+    A_sym.sort_indices()
+    return A_sym
+
+
+# ======================================
+# DEGREE / LAPLACIAN
+# ======================================
+def degree_vector(A: sp.spmatrix) -> np.ndarray:
+    """
+    Weighted degree d_i = sum_j A_ij.
+    """
+    return np.asarray(A.sum(axis=1)).ravel()
+
+
+def laplacian(A: sp.spmatrix) -> sp.csr_matrix:
+    """
+    H_L = D - A (sparse).
+    """
+    return (sp.diags(degree_vector(A)) - A).tocsr()
+
+
+# ======================================
+# SERIALIZATION
+# ======================================
+def save_sparse(path: str, M: sp.spmatrix):
+    """
+    Save as compressed .npz (scipy.sparse format).
+    """
+    sp.save_npz(path, sp.csr_matrix(M))
+
+
+def load_sparse(path: str) -> sp.csr_matrix:
+    """
+    Load a graph operator as CSR.
+    Accepts .npz (sparse) or legacy dense .npy files.
+    """
+    if path.endswith(".npy"):
+        return sp.csr_matrix(np.load(path))
+    return sp.load_npz(path).tocsr()
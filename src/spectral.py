@@ -1,7 +1,18 @@
 # src/spectral.py
+"""
+Canonical STFT magnitude spectrograms, one segment at a time
+(librosa.stft) or batched (strided frames + one real FFT).
+
+The two paths are identical only with zero ("constant") center padding.
+librosa changed its stft default to that in 0.10 (it was "reflect"), so
+the single-segment path passes STFT_PAD_MODE explicitly rather than
+relying on the installed version.
+"""
 
 import numpy as np
 import librosa
+import scipy.fft
+from scipy.signal import get_window
 
 # ======================================
 # CANONICAL STFT GEOMETRY (LOCKED)
@@ -12,6 +23,15 @@ HOP_LENGTH = 512
 EXPECTED_FREQ_BINS = N_FFT // 2 + 1  # 1025
 MAX_FRAMES = 128                     # HARD LIMIT
 
+# samples that can reach the first MAX_FRAMES centered frames
+MAX_SAMPLES = (MAX_FRAMES - 1) * HOP_LENGTH + N_FFT // 2
+
+# segments per FFT call in the batched path
+STFT_BATCH = 64
+
+# center padding of both paths (see module docstring)
+STFT_PAD_MODE = "constant"
+
 
 # ======================================
 # STEP 3 — STFT COMPUTATION
@@ -24,7 +44,8 @@ def compute_stft_mag(audio: np.ndarray) -> np.ndarray:
         audio,
         n_fft=N_FFT,
         hop_length=HOP_LENGTH,
-        center=True
+        center=True,
+        pad_mode=STFT_PAD_MODE
     )
     mag = np.abs(stft)
     return mag
@@ -69,3 +90,49 @@ def extract_normalized_spectrogram(audio: np.ndarray) -> np.ndarray:
     mag_norm = normalize_stft_shape(mag)
     return mag_norm
 
+
+# ======================================
+# BATCHED PIPELINE
+# ======================================
+def num_frames(length: int) -> int:
+    """
+    Frames of a centered STFT of `length` samples, capped at MAX_FRAMES.
+    """
+    return min(1 + length // HOP_LENGTH, MAX_FRAMES)
+
+
+def extract_normalized_spectrograms(audios, batch_size: int = STFT_BATCH) -> np.ndarray:
+    """
+    Many 1D audios -> (num_segments, EXPECTED_FREQ_BINS, MAX_FRAMES) float32.
+
+    Same result as extract_normalized_spectrogram per segment (centered,
+    zero-padded, periodic Hann window), but each batch is zero-padded to
+    one (B, MAX_SAMPLES) matrix and framed with strides. Every frame in
+    the batch then goes through ONE real FFT. Columns past each
+    segment's own frame count are zeroed, which is the bulk trim/pad.
+    """
+    out = np.zeros((len(audios), EXPECTED_FREQ_BINS, MAX_FRAMES), dtype=np.float32)
+    window = get_window("hann", N_FFT, fftbins=True).astype(np.float32)
+    pad = N_FFT // 2
+
+    for b0 in range(0, len(audios), batch_size):
+        chunk = audios[b0:b0 + batch_size]
+
+        # centered + zero-padded (STFT_PAD_MODE) signals, only as long as MAX_FRAMES needs
+        padded = np.zeros((len(chunk), MAX_SAMPLES + 2 * pad), dtype=np.float32)
+        frames_per_seg = np.empty(len(chunk), dtype=np.int64)
+        for i, audio in enumerate(chunk):
+            n = min(len(audio), MAX_SAMPLES)
+            padded[i, pad:pad + n] = audio[:n]
+            frames_per_seg[i] = num_frames(len(audio))
+
+        frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT, axis=1)
+        frames = frames[:, ::HOP_LENGTH][:, :MAX_FRAMES]          # (B, MAX_FRAMES, N_FFT)
+
+        mag = np.abs(scipy.fft.rfft(frames * window, axis=-1))   # (B, MAX_FRAMES, bins)
+        mag[np.arange(MAX_FRAMES)[None, :] >= frames_per_seg[:, None]] = 0.0
+
+        out[b0:b0 + len(chunk)] = mag.transpose(0, 2, 1)
+
+    return out
+
@@ -0,0 +1,243 @@
+# src/spectrum.py
+"""
+Spectrum diagnostics for graph Hamiltonians without full diagonalization.
+
+    - extreme eigenvalues: Lanczos (scipy eigsh) on the sparse H
+    - spectral density:    stochastic Lanczos quadrature (SLQ) —
+      a few random probes, each a short Lanczos run whose Ritz values /
+      squared first eigenvector components are quadrature nodes / weights
+      of the probe's spectral measure; averaged, they estimate the
+      eigenvalue histogram
+    - small N: exact full eigh (optional, same report)
+    - spectral_statistics(): degeneracies, multiplicity clusters, level
+      spacings and gaps of a full eigenvalue list, vectorized
+    - extreme_gap(): gap at one end of the spectrum from Lanczos only,
+      growing k while the computed end is a single degenerate level
+
+Memory is O(N * LANCZOS_STEPS), time O(nnz * LANCZOS_STEPS * SLQ_PROBES).
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import eigsh
+
+EXACT_MAX_N = 4000      # "auto" mode uses full eigh up to this size
+N_EXTREME = 6           # eigenvalues computed at each end of the spectrum
+SLQ_PROBES = 16
+LANCZOS_STEPS = 64
+SEED = 0
+
+DEGENERACY_TOL = 1e-6
+SPACING_BINS = 40
+SPACING_RANGE = (0.0, 4.0)   # in units of the mean level spacing
+MAX_GAP_K = 1024             # largest eigsh k tried by extreme_gap
+
+
+# ======================================
+# EXTREME EIGENVALUES (LANCZOS)
+# ======================================
+def extreme_eigenvalues(H, k: int = N_EXTREME) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (k smallest, k largest) eigenvalues of sparse symmetric H, ascending.
+    """
+    H = sp.csr_matrix(H, dtype=float)
+    k = min(k, H.shape[0] - 1)
+
+    low = eigsh(H, k=k, which="SA", return_eigenvectors=False)
+    high = eigsh(H, k=k, which="LA", return_eigenvectors=False)
+    return np.sort(low), np.sort(high)
+
+
+# ======================================
+# SPECTRAL DENSITY (SLQ)
+# ======================================
+def _lanczos(H, v, steps):
+    """
+    Tridiagonal (alpha, beta) of `steps` Lanczos iterations from v,
+    with full reorthogonalization (steps is small).
+    """
+    N = len(v)
+    Q = np.zeros((steps, N))
+    alpha = np.zeros(steps)
+    beta = np.zeros(max(steps - 1, 0))
+
+    q = v / np.linalg.norm(v)
+    for j in range(steps):
+        Q[j] = q
+        w = H @ q
+        alpha[j] = q @ w
+        w -= Q[:j + 1].T @ (Q[:j + 1] @ w)          # reorthogonalize
+        if j == steps - 1:
+            break
+        b = np.linalg.norm(w)
+        if b < 1e-12:                                # invariant subspace
+            return alpha[:j + 1], beta[:j]
+        beta[j] = b
+        q = w / b
+
+    return alpha, beta
+
+
+def spectral_density(H, probes: int = SLQ_PROBES, steps: int = LANCZOS_STEPS,
+                     seed: int = SEED) -> tuple[np.ndarray, np.ndarray]:
+    """
+    SLQ estimate of the eigenvalue distribution of H.
+
+    Returns (nodes, weights); weights sum to N, so
+    np.histogram(nodes, bins, weights=weights) approximates the
+    histogram of the exact eigenvalues.
+    """
+    H = sp.csr_matrix(H, dtype=float)
+    N = H.shape[0]
+    steps = min(steps, N)
+    rng = np.random.default_rng(seed)
+
+    nodes, weights = [], []
+    for _ in range(probes):
+        v = rng.choice([-1.0, 1.0], size=N)          # Rademacher probe
+        alpha, beta = _lanczos(H, v, steps)
+
+        T = np.diag(alpha) + np.diag(beta, 1) + np.diag(beta, -1)
+        theta, U = np.linalg.eigh(T)
+        nodes.append(theta)
+        weights.append(U[0] ** 2)
+
+    nodes = np.concatenate(nodes)
+    weights = np.concatenate(weights) * N / probes
+    return nodes, weights
+
+
+# ======================================
+# REPORT
+# ======================================
+def spectrum_report(H, mode: str = "auto", exact_max_n: int = EXACT_MAX_N,
+                    eigvals: np.ndarray = None) -> dict:
+    """
+    Spread / extremes / density of H's spectrum.
+
+    mode: "exact"   full eigh (or the given eigvals, e.g. from eigen_cache)
+          "partial" Lanczos extremes + SLQ density
+          "auto"    exact when N <= exact_max_n
+    """
+    N = H.shape[0]
+    if mode == "auto":
+        mode = "exact" if N <= exact_max_n else "partial"
+    if mode not in ("exact", "partial"):
+        raise ValueError(f"Unknown spectrum mode {mode!r}")
+
+    if mode == "exact":
+        if eigvals is None:
+            H_dense = H.toarray() if sp.issparse(H) else np.asarray(H)
+            eigvals = np.linalg.eigvalsh(H_dense)
+        eigvals = np.sort(np.asarray(eigvals))
+        low, high = eigvals[:N_EXTREME], eigvals[-N_EXTREME:]
+        nodes, weights = eigvals, np.ones(N)
+    else:
+        eigvals = None
+        low, high = extreme_eigenvalues(H)
+        nodes, weights = spectral_density(H)
+
+    return {
+        "mode": mode,
+        "num_nodes": N,
+        "min": float(low[0]),
+        "max": float(high[-1]),
+        "spread": float(high[-1] - low[0]),
+        "lowest": low,
+        "highest": high,
+        "density_nodes": nodes,
+        "density_weights": weights,
+        "eigvals": eigvals,
+    }
+
+
+# ======================================
+# SPECTRAL STATISTICS (SORTED, VECTORIZED)
+# ======================================
+def spectral_statistics(eigvals: np.ndarray, tol: float = DEGENERACY_TOL) -> dict:
+    """
+    Degeneracy / level statistics of a full eigenvalue list in O(n log n).
+
+    After sorting, an eigenvalue joins the current level if it is within
+    tol of the level's FIRST member, else it starts a new level (the
+    rule of the old pairwise count, so chains of small gaps spanning
+    more than tol are not merged). Spacings only mean something for a contiguous
+    spectrum, so do not pass joined Lanczos extremes (see extreme_gap).
+
+        levels             distinct level values, ascending
+        degeneracies       n - number of distinct levels
+        clusters           (center, multiplicity) of levels with multiplicity > 1
+        spacings           gaps between consecutive distinct levels
+        spacing_histogram  (counts, edges) of spacings / mean spacing
+        spectral_gap       second level - lowest level (λ2 for H_L)
+        top_gap            highest level - second highest (CTQW gap for H_A)
+    """
+    ev = np.sort(np.real(np.asarray(eigvals)))
+    n = len(ev)
+    if n == 0:
+        raise ValueError("No eigenvalues given")
+
+    # next level start after i = first eigenvalue >= ev[i] + tol;
+    # binary search for all i, then one hop per level from index 0
+    nxt = np.searchsorted(ev, ev + tol, side="left")
+    starts = np.zeros(n, dtype=bool)
+    i = 0
+    while i < n:
+        starts[i] = True
+        i = nxt[i]
+    level_of = np.cumsum(starts) - 1
+    multiplicity = np.bincount(level_of)
+
+    # level value = mean of its eigenvalues
+    levels = np.bincount(level_of, weights=ev) / multiplicity
+
+    spacings = np.diff(levels)
+    mean_spacing = float(spacings.mean()) if len(spacings) else 0.0
+    normalized = spacings / mean_spacing if mean_spacing > 0 else spacings
+
+    multi = multiplicity > 1
+    return {
+        "num_eigvals": n,
+        "num_levels": len(levels),
+        "levels": levels,
+        "degeneracies": int(n - len(levels)),
+        "clusters": np.stack([levels[multi], multiplicity[multi]], axis=1),
+        "spacings": spacings,
+        "mean_spacing": mean_spacing,
+        "spacing_histogram": np.histogram(normalized, bins=SPACING_BINS, range=SPACING_RANGE),
+        "spectral_gap": float(spacings[0]) if len(spacings) else 0.0,
+        "top_gap": float(spacings[-1]) if len(spacings) else 0.0,
+    }
+
+
+def extreme_gap(H, end: str = "bottom", values: np.ndarray = None, k: int = N_EXTREME,
+                tol: float = DEGENERACY_TOL, max_k: int = MAX_GAP_K) -> float:
+    """
+    Gap between the two lowest ("bottom") or two highest ("top")
+    distinct levels of sparse symmetric H, without full diagonalization.
+
+    `values` are eigenvalues already computed at that end (e.g.
+    spectrum_report()["lowest"]), used if there are at least k of them.
+    While every computed eigenvalue is one degenerate level, k is
+    doubled and eigsh rerun; raises ValueError past max_k.
+    """
+    if end not in ("bottom", "top"):
+        raise ValueError(f"Unknown spectrum end {end!r}")
+
+    H = sp.csr_matrix(H, dtype=float)
+    k_limit = min(max_k, H.shape[0] - 1)
+    k = min(k, k_limit)
+
+    while True:
+        if values is None or len(values) < k:
+            values = eigsh(H, k=k, which="SA" if end == "bottom" else "LA",
+                           return_eigenvectors=False)
+
+        levels = spectral_statistics(values, tol)["levels"]
+        if len(levels) > 1:
+            return float(levels[1] - levels[0]) if end == "bottom" else float(levels[-1] - levels[-2])
+
+        if k >= k_limit:
+            raise ValueError(f"Spectral gap not resolved: the {len(values)} {end} "
+                             f"eigenvalues are one degenerate level")
+        k = min(2 * max(k, len(values)), k_limit)
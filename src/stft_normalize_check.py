@@ -2,9 +2,9 @@
 
 import os
 import numpy as np
-import librosa
 import soundfile as sf
 from dataclasses import dataclass
+from spectral import extract_normalized_spectrograms
 
 # =========================
 # CONFIG (DO NOT CHANGE)
@@ -32,37 +32,6 @@ class Segment:
     features: np.ndarray = None
     global_index: int = None
 
-# =========================
-# STFT FUNCTIONS
-# =========================
-def compute_stft_mag(audio: np.ndarray):
-    stft = librosa.stft(
-        audio,
-        n_fft=N_FFT,
-        hop_length=HOP_LENGTH,
-        center=True
-    )
-    mag = np.abs(stft)
-    return mag
-
-def normalize_stft_shape(mag: np.ndarray):
-    freq_bins, time_frames = mag.shape
-
-    if freq_bins != EXPECTED_FREQ_BINS:
-        raise ValueError(
-            f"Frequency bin mismatch: expected {EXPECTED_FREQ_BINS}, got {freq_bins}"
-        )
-
-    if time_frames > MAX_FRAMES:
-        return mag[:, :MAX_FRAMES]
-
-    if time_frames < MAX_FRAMES:
-        pad = MAX_FRAMES - time_frames
-        padding = np.zeros((freq_bins, pad), dtype=mag.dtype)
-        return np.concatenate([mag, padding], axis=1)
-
-    return mag
-
 # =========================
 # MAIN CHECK PIPELINE
 # =========================
@@ -74,17 +43,20 @@ def main():
 
     print(f"[INFO] Found {len(files)} segment WAV files")
 
-    segments = []
-
-    for idx, fname in enumerate(files):
-        path = os.path.join(SEGMENT_DIR, fname)
-
-        audio, sr = sf.read(path)
+    audios = []
+    for fname in files:
+        audio, sr = sf.read(os.path.join(SEGMENT_DIR, fname), dtype="float32")
         if sr != TARGET_SR:
             raise ValueError(f"Sample rate mismatch in {fname}")
+        audios.append(audio)
 
-        mag = compute_stft_mag(audio)
-        mag_norm = normalize_stft_shape(mag)
+    # one batched STFT for every segment: (num_segments, 1025, 128)
+    mags = extract_normalized_spectrograms(audios)
+
+    segments = []
+
+    for idx, fname in enumerate(files):
+        mag_norm = mags[idx]
 
         seg = Segment(
             id=fname.replace(".wav", ""),
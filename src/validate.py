@@ -1,6 +1,6 @@
-import pickle
+from feature_store import load_segments
 
-db = pickle.load(open("database/master_db.pkl", "rb"))
+db = load_segments("database/master_db")
 
 seg = db[0]
 
@@ -0,0 +1,65 @@
+# src/virtual_segments.py
+"""
+Virtual segments: slice on read from the normalized song arrays.
+
+A virtual segment is just (song, start_sample, end_sample). The audio
+is read from the memory-mapped raw_songs/<song>.npy written by
+audio_io.py, copied, and given the same 10 ms fade as slicing.py — so
+no per-bar WAV files have to exist at all.
+"""
+
+import os
+
+import numpy as np
+
+from slicing import apply_fade, RAW_SONGS_DIR, TARGET_SR
+
+FADE_MS = 10
+
+_songs = {}
+
+
+def song_array(song: str) -> np.ndarray:
+    """
+    Read-only memmap of one normalized song (opened once per process).
+    """
+    if song not in _songs:
+        npy_path = os.path.join(RAW_SONGS_DIR, song + ".npy")
+        if not os.path.exists(npy_path):
+            raise FileNotFoundError(f"Could not find {npy_path}. Did you run audio_io.py?")
+        _songs[song] = np.load(npy_path, mmap_mode="r")
+    return _songs[song]
+
+
+def sample_range(start_time: float, end_time: float, sr: int = TARGET_SR) -> tuple[int, int]:
+    """
+    Bar times (s) -> sample range, rounded exactly like slicing.slice_segment.
+    """
+    return int(start_time * sr), int(end_time * sr)
+
+
+def read_virtual_segment(song: str, start_sample: int, end_sample: int,
+                         sr: int = TARGET_SR) -> np.ndarray:
+    """
+    float32 copy of song[start_sample:end_sample] with fade-in/out applied,
+    at `sr`. Song arrays (and the sample range) are at TARGET_SR.
+    """
+    audio = np.array(song_array(song)[start_sample:end_sample], dtype=np.float32)
+    audio = apply_fade(audio, TARGET_SR, fade_ms=FADE_MS)
+
+    if sr != TARGET_SR:
+        # same fallback as segment_cache.read_segment_audio
+        import librosa
+        audio = librosa.resample(audio, orig_sr=TARGET_SR, target_sr=sr)
+
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def segment_source(seg):
+    """
+    Where a Segment's audio comes from:
+    (song, start_sample, end_sample) for virtual segments, else its wav_path.
+    """
+    if getattr(seg, "start_sample", None) is not None:
+        return seg.parent_song, seg.start_sample, seg.end_sample
+    return seg.wav_path
@@ -7,16 +7,17 @@ Attach a reproducible ℝ^40 feature vector to each segment
 to be used for similarity graph construction.
 """
 
-import pickle
 import numpy as np
-import librosa
 from collections import defaultdict
+from feature_store import load_segments, save_segments, META_COLUMNS
+from mel_features import mel_features
+from feature_cache import split_cached, save_fields
 
 # =========================
 # CONFIG (FROZEN)
 # =========================
-MASTER_DB_PATH = "database/master_db.pkl"
-OUT_PATH = "database/master_db_features_raw.pkl"
+MASTER_DB_PATH = "database/master_db"
+OUT_PATH = "database/master_db_features_raw"
 
 TARGET_SR = 22050
 N_MELS = 40
@@ -24,11 +25,12 @@ N_MELS = 40
 MAX_SEGMENTS_PER_SONG = 8          # 8 × 8 songs = 64 total
 EXPECTED_SEGMENT_RANGE = (60, 90)
 
+INCREMENTAL = True   # reuse mel vectors cached by content hash (feature_cache.py)
+
 # =========================
 # LOAD DATABASE
 # =========================
-with open(MASTER_DB_PATH, "rb") as f:
-    segments = pickle.load(f)
+segments = load_segments(MASTER_DB_PATH)   # columns are mapped lazily
 
 print(f"[INFO] Loaded {len(segments)} total segments from Week 1 DB")
 
@@ -77,17 +79,25 @@ print(f"[OK] All spectrograms have identical shape {ref_shape}")
 # =========================
 # FEATURE EXTRACTION
 # =========================
-for seg in segments:
-    S_power = seg.spectrogram ** 2
+keys = [seg.content_hash for seg in segments]   # set by day6_features
 
-    mel = librosa.feature.melspectrogram(
-        S=S_power,
-        sr=TARGET_SR,
-        n_mels=N_MELS
-    )
+if INCREMENTAL and all(keys):
+    cached, stale = split_cached(keys, "features")
+else:
+    cached, stale = {}, list(range(len(segments)))
+
+# one shared filterbank, one matmul over all new / changed spectrograms
+fresh = mel_features([segments[i].spectrogram for i in stale])
+
+for i, mel_vec in zip(stale, fresh):
+    cached[i] = mel_vec
+    if keys[i]:
+        save_fields(keys[i], features=mel_vec)
+
+for i, seg in enumerate(segments):
+    seg.features = cached[i]
 
-    mel_vec = mel.mean(axis=1)
-    seg.features = mel_vec
+print(f"[INFO] Mel features: {len(segments) - len(stale)} cached, {len(stale)} computed")
 
 print("[SUCCESS] Feature extraction complete")
 
@@ -108,8 +118,8 @@ assert not np.isinf(v).any()
 # =========================
 # SAVE RAW FEATURE DB
 # =========================
-with open(OUT_PATH, "wb") as f:
-    pickle.dump(segments, f)
+# spectrograms stay in the master DB; downstream stages only need features
+save_segments(segments, OUT_PATH, columns=[*META_COLUMNS, "features", "wavelet_energy"])
 
 print(f"[DONE] Raw feature DB saved → {OUT_PATH}")
 
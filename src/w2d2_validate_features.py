@@ -6,13 +6,13 @@ This script validates raw (unnormalized) feature vectors
 before normalization and similarity computation.
 """
 
-import pickle
+from feature_store import load_segments
 import numpy as np
 
 # =========================
 # CONFIG
 # =========================
-RAW_FEATURE_DB = "database/master_db_features_raw.pkl"
+RAW_FEATURE_DB = "database/master_db_features_raw"
 
 VAR_THRESHOLD = 1e-6
 NORM_RATIO_THRESHOLD = 10.0
@@ -20,8 +20,7 @@ NORM_RATIO_THRESHOLD = 10.0
 # =========================
 # LOAD RAW FEATURES
 # =========================
-with open(RAW_FEATURE_DB, "rb") as f:
-    segments = pickle.load(f)
+segments = load_segments(RAW_FEATURE_DB)
 
 print(f"[INFO] Loaded {len(segments)} segments")
 
@@ -10,14 +10,15 @@ This step is mathematically mandatory for cosine similarity
 and quantum Hamiltonian construction.
 """
 
-import pickle
 import numpy as np
+from feature_store import load_segments, save_segments
+from mel_features import l2_normalize
 
 # =========================
 # CONFIG (FROZEN)
 # =========================
-IN_PATH = "database/master_db_features_raw.pkl"
-OUT_PATH = "database/master_db_features_norm.pkl"
+IN_PATH = "database/master_db_features_raw"
+OUT_PATH = "database/master_db_features_norm"
 
 NORM_EPS = 1e-8
 UNIT_NORM_TOL = 1e-3
@@ -25,35 +26,22 @@ UNIT_NORM_TOL = 1e-3
 # =========================
 # LOAD RAW FEATURE DB
 # =========================
-with open(IN_PATH, "rb") as f:
-    segments = pickle.load(f)
+segments = load_segments(IN_PATH)
 
 print(f"[INFO] Loaded {len(segments)} segments")
 
 # =========================
 # NORMALIZATION
 # =========================
-norms = []
-
 for seg in segments:
-    v = seg.features
-
-    if v is None:
+    if seg.features is None:
         raise ValueError(f"Missing features in segment {seg.id}")
 
-    norm = np.linalg.norm(v)
-    norms.append(norm)
-
-    if not np.isfinite(norm):
-        raise ValueError(f"Non-finite norm in segment {seg.id}")
-
-    if norm < NORM_EPS:
-        raise ValueError(
-            f"Degenerate feature vector detected in segment {seg.id} "
-            f"(norm={norm:.2e})"
-        )
+X = np.array([seg.features for seg in segments], dtype=np.float64)   # (N, 40)
+X, norms = l2_normalize(X, ids=[seg.id for seg in segments], eps=NORM_EPS)
 
-    seg.features = v / norm
+for seg, v in zip(segments, X.astype(np.float32)):
+    seg.features = v
 
 # =========================
 # VERIFICATION
@@ -76,7 +64,6 @@ print(
 # =========================
 # SAVE NORMALIZED DB
 # =========================
-with open(OUT_PATH, "wb") as f:
-    pickle.dump(segments, f)
+save_segments(segments, OUT_PATH)
 
 print(f"[DONE] Normalized feature DB saved → {OUT_PATH}")
@@ -7,62 +7,68 @@ Similarity:
 - SAME_SONG_PENALTY applied for same parent_song
 """
 
-import pickle
 import numpy as np
+from feature_store import FeatureStore
+from scoring import song_codes, compatibility_matrix, SIMILARITY_BLOCK_ROWS
 
 # =========================
 # CONFIG
 # =========================
-IN_PATH = "database/master_db_features_norm.pkl"
+IN_PATH = "database/master_db_features_norm"
 OUT_PATH = "database/similarity_matrix.npy"
 
-SAME_SONG_PENALTY = 0.7
+BLOCK_ROWS = SIMILARITY_BLOCK_ROWS   # rows of X @ X.T held in memory at once
+SYMMETRY_SAMPLES = 100_000           # random (i, j) pairs checked against (j, i)
 
 # =========================
 # LOAD NORMALIZED FEATURES
 # =========================
-with open(IN_PATH, "rb") as f:
-    segments = pickle.load(f)
+store = FeatureStore(IN_PATH)   # only features + parent_song are mapped
 
-N = len(segments)
+N = len(store)
 print(f"[INFO] Loaded {N} segments")
 
 # =========================
 # BUILD FEATURE MATRIX
 # =========================
-X = np.stack([seg.features for seg in segments])  # (N, 40)
+X = np.array(store.column("features"), dtype=float)  # (N, 40)
+codes = song_codes(store.column("parent_song"))   # parent_song -> int
 
 # Sanity: unit norm
 norms = np.linalg.norm(X, axis=1)
 assert np.allclose(norms, 1.0, atol=1e-6), "Features are not unit-normalized"
 
 # =========================
-# COSINE SIMILARITY
+# COSINE SIMILARITY + SAME-SONG PENALTY (BLOCKED)
 # =========================
-S = X @ X.T  # (N, N)
-
-# =========================
-# APPLY SAME-SONG PENALTY
-# =========================
-for i in range(N):
-    for j in range(N):
-        if segments[i].parent_song == segments[j].parent_song:
-            S[i, j] *= SAME_SONG_PENALTY
+# float32, written block by block straight into the .npy file
+S = np.lib.format.open_memmap(OUT_PATH, mode="w+", dtype=np.float32, shape=(N, N))
+compatibility_matrix(X, codes, out=S, block_rows=BLOCK_ROWS)
 
 print("[OK] Same-song penalty applied")
 
 # =========================
-# SANITY CHECKS
+# SANITY CHECKS (PER BLOCK)
 # =========================
-assert np.allclose(S, S.T, atol=1e-8), "Similarity matrix not symmetric"
-assert np.all(np.isfinite(S)), "NaN or Inf in similarity matrix"
+# compatibility_scores is symmetric by construction; a random sample of
+# pairs catches a broken write without reading the file column-wise
+rng = np.random.default_rng(0)
+i, j = rng.integers(0, N, size=(2, SYMMETRY_SAMPLES))
+assert np.allclose(S[i, j], S[j, i], atol=1e-6), "Similarity matrix not symmetric"
+
+s_min, s_max = np.inf, -np.inf
+for r0 in range(0, N, BLOCK_ROWS):
+    block = S[r0:r0 + BLOCK_ROWS]
+    assert np.all(np.isfinite(block)), "NaN or Inf in similarity matrix"
+    s_min, s_max = min(s_min, float(block.min())), max(s_max, float(block.max()))
 
 print("[SANITY CHECK]")
-print("  Min similarity:", float(S.min()))
-print("  Max similarity:", float(S.max()))
+print("  Min similarity:", s_min)
+print("  Max similarity:", s_max)
 
 # =========================
 # SAVE
 # =========================
-np.save(OUT_PATH, S)
+S.flush()
+del S
 print(f"[DONE] Similarity matrix saved → {OUT_PATH}")
@@ -2,54 +2,64 @@
 Week 2 — Day 5 (Gagan)
 KNN Graph Construction (RAW)
 
-- Builds a weighted KNN graph from similarity matrix
+- Builds a weighted KNN graph by streaming row blocks of the
+  similarity matrix (the similarity_matrix.npy file is optional)
 - Graph may be asymmetric (expected)
+- Stored as sparse CSR (at most K non-zeros per row)
 """
 
 import numpy as np
-import pickle
+from feature_store import FeatureStore
+from scoring import song_codes
+from sparse_graph import knn_adjacency, knn_adjacency_streaming, save_sparse
+from ann_index import ann_knn_adjacency, knn_recall, TARGET_RECALL
 
 # =========================
 # CONFIG
 # =========================
 SIM_PATH = "database/similarity_matrix.npy"
-DB_PATH = "database/master_db_features_norm.pkl"
-OUT_PATH = "database/adjacency_raw.npy"
+DB_PATH = "database/master_db_features_norm"
+OUT_PATH = "database/adjacency_raw.npz"
 
 K = 7  # allowed: 5 or 7
 
-# =========================
-# LOAD DATA
-# =========================
-S = np.load(SIM_PATH)
-with open(DB_PATH, "rb") as f:
-    segments = pickle.load(f)
-
-N = S.shape[0]
-assert S.shape == (N, N)
-
-print(f"[INFO] Loaded similarity matrix ({N} x {N})")
+USE_SIMILARITY_FILE = False   # True: read SIM_PATH (w2d4) instead of streaming
+USE_ANN = False               # True: approximate IVF index (ann_index.py), ~N * n_probe * LIST_SIZE
+RECALL_SAMPLE = 1000          # rows checked against exact top-K when USE_ANN
 
 # =========================
-# BUILD KNN GRAPH (RAW)
+# LOAD DATA + BUILD KNN GRAPH (RAW)
 # =========================
-A_raw = np.zeros_like(S)
-
-for i in range(N):
-    # Exclude self
-    scores = S[i].copy()
-    scores[i] = -np.inf
+# Top-K neighbors per row, self excluded
+if USE_SIMILARITY_FILE:
+    S = np.load(SIM_PATH, mmap_mode="r")
+    N = S.shape[0]
+    assert S.shape == (N, N)
+    print(f"[INFO] Loaded similarity matrix ({N} x {N})")
 
-    # Top-K neighbors
-    knn_idx = np.argsort(scores)[-K:]
+    A_raw = knn_adjacency(S, K)   # reads the memmap in row blocks
+else:
+    store = FeatureStore(DB_PATH)
+    X = np.asarray(store.column("features"), dtype=np.float32)     # (N, 40)
+    codes = song_codes(store.column("parent_song"))
+    N = len(X)
 
-    for j in knn_idx:
-        A_raw[i, j] = S[i, j]
+    if USE_ANN:
+        print(f"[INFO] Building IVF index over {N} segments")
+        A_raw = ann_knn_adjacency(X, codes, K, target_recall=TARGET_RECALL)
+        recall = knn_recall(A_raw, X, codes, K, RECALL_SAMPLE)
+        print(f"[CHECK] Recall@{K} vs exact: {recall:.3f}")
+        if recall < TARGET_RECALL:
+            print(f"[WARN] ANN recall {recall:.3f} is below {TARGET_RECALL} — "
+                  f"raise n_probe or set USE_ANN = False")
+    else:
+        print(f"[INFO] Streaming similarity blocks for {N} segments")
+        A_raw = knn_adjacency_streaming(X, codes, K)
 
-print(f"[DONE] KNN graph built (K={K})")
+print(f"[DONE] KNN graph built (K={K}, nnz={A_raw.nnz})")
 
 # =========================
 # SAVE
 # =========================
-np.save(OUT_PATH, A_raw)
+save_sparse(OUT_PATH, A_raw)
 print(f"[SAVED] Raw adjacency matrix → {OUT_PATH}")
@@ -9,18 +9,19 @@ Ensures:
 - Sparse degree distribution
 """
 
-import numpy as np
+from sparse_graph import load_sparse, save_sparse, symmetrize_max
+from graph_validation import validate_graph, print_report
 
 # =========================
 # CONFIG
 # =========================
-RAW_PATH = "database/adjacency_raw.npy"
-OUT_PATH = "database/adjacency_sym.npy"
+RAW_PATH = "database/adjacency_raw.npz"
+OUT_PATH = "database/adjacency_sym.npz"
 
 # =========================
 # LOAD RAW GRAPH
 # =========================
-A_raw = np.load(RAW_PATH)
+A_raw = load_sparse(RAW_PATH)
 N = A_raw.shape[0]
 
 assert A_raw.shape == (N, N)
@@ -29,43 +30,23 @@ print(f"[INFO] Loaded raw adjacency matrix ({N} nodes)")
 # =========================
 # SYMMETRIZATION (CORE STEP)
 # =========================
-A_sym = np.maximum(A_raw, A_raw.T)
-
-# Remove self-loops explicitly
-np.fill_diagonal(A_sym, 0.0)
+# Self-loops removed explicitly
+A_sym = symmetrize_max(A_raw)
 
 print("[OK] Graph symmetrized using max(A_ij, A_ji)")
 
 # =========================
-# VALIDATION CHECKS
+# VALIDATION CHECKS (SPARSE, see graph_validation.py)
 # =========================
-# 1. Symmetry
-assert np.allclose(A_sym, A_sym.T, atol=1e-10), "Graph is not symmetric!"
-
-# 2. No self-loops
-assert np.all(np.diag(A_sym) == 0.0), "Self-loops detected!"
-
-# 3. No isolated nodes
-degrees = np.count_nonzero(A_sym, axis=1)
-isolated = np.where(degrees == 0)[0]
-assert len(isolated) == 0, f"Isolated nodes detected: {isolated}"
-
-# 4. Sparsity check
-avg_degree = degrees.mean()
-density = np.count_nonzero(A_sym) / (N * N)
-
-print("[GRAPH STATS]")
-print(f"  Avg degree: {avg_degree:.2f}")
-print(f"  Min degree: {degrees.min()}")
-print(f"  Max degree: {degrees.max()}")
-print(f"  Density: {density:.4f}")
-
-assert density < 0.2, "Graph too dense — quantum walk will be meaningless!"
+# symmetry (CSR pattern + values), no self-loops, no isolated nodes,
+# density < 0.2; components found in the same pass
+report = validate_graph(A_sym, max_density=0.2)
+print_report(report)
 
 print("[SUCCESS] Graph passed all sanity checks")
 
 # =========================
 # SAVE SYMMETRIC GRAPH
 # =========================
-np.save(OUT_PATH, A_sym)
+save_sparse(OUT_PATH, A_sym)
 print(f"[SAVED] Symmetric adjacency matrix → {OUT_PATH}")
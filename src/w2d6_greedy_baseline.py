@@ -4,13 +4,14 @@ Classical Greedy Baseline Path
 """
 
 import numpy as np
-import pickle
+from feature_store import load_segments
+from sparse_graph import load_sparse
 
 # =========================
 # CONFIG
 # =========================
-ADJ_PATH = "database/adjacency_sym.npy"
-DB_PATH = "database/master_db_features_norm.pkl"
+ADJ_PATH = "database/adjacency_sym.npz"
+DB_PATH = "database/master_db_features_norm"
 
 MAX_PATH_LEN = 20
 START_NODE = 0          # deterministic
@@ -19,10 +20,9 @@ KEY_PENALTY = 0.85      # optional, mild
 # =========================
 # LOAD DATA
 # =========================
-A = np.load(ADJ_PATH)
+A = load_sparse(ADJ_PATH)
 
-with open(DB_PATH, "rb") as f:
-    segments = pickle.load(f)
+segments = load_segments(DB_PATH)
 
 N = len(segments)
 print(f"[INFO] Loaded graph with {N} segments")
@@ -35,7 +35,7 @@ visited = set(path)
 
 while len(path) < MAX_PATH_LEN:
     current = path[-1]
-    weights = A[current].copy()
+    weights = A[current].toarray().ravel()
 
     # Mask visited nodes
     for v in visited:
@@ -3,15 +3,16 @@ Week 2 — Day 6
 Graph Visualization (Classical Sanity Check)
 """
 
-import numpy as np
+import scipy.sparse as sp
 import networkx as nx
 import matplotlib.pyplot as plt
 import os
+from sparse_graph import load_sparse
 
 # =========================
 # CONFIG
 # =========================
-ADJ_PATH = "database/adjacency_sym.npy"
+ADJ_PATH = "database/adjacency_sym.npz"
 OUT_DIR = "outputs"
 OUT_IMG = os.path.join(OUT_DIR, "graph_visualization.png")
 
@@ -20,7 +21,7 @@ os.makedirs(OUT_DIR, exist_ok=True)
 # =========================
 # LOAD GRAPH
 # =========================
-A = np.load(ADJ_PATH)
+A = load_sparse(ADJ_PATH)
 N = A.shape[0]
 
 print(f"[INFO] Loaded symmetric adjacency matrix ({N} nodes)")
@@ -33,10 +34,11 @@ G = nx.Graph()
 for i in range(N):
     G.add_node(i)
 
-for i in range(N):
-    for j in range(i + 1, N):
-        if A[i, j] > 0:
-            G.add_edge(i, j, weight=A[i, j])
+# upper triangle only: each undirected edge once
+upper = sp.triu(A, k=1).tocoo()
+for i, j, w in zip(upper.row, upper.col, upper.data):
+    if w > 0:
+        G.add_edge(int(i), int(j), weight=float(w))
 
 print(f"[INFO] Graph has {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
 
@@ -4,16 +4,17 @@ Save finalized graph object for Week 3 quantum walk
 """
 
 import pickle
-import numpy as np
+from sparse_graph import load_sparse
 
 GRAPH_PATH = "database/graph_object.pkl"
 
-adj = np.load("database/adjacency_sym.npy")
+adj = load_sparse("database/adjacency_sym.npz")   # CSR
 
 graph = {
     "adjacency": adj,
     "num_nodes": adj.shape[0],
     "type": "knn_similarity_graph",
+    "format": "csr",
     "symmetrization": "A[i,j] = max(A_ij, A_ji)",
 }
 
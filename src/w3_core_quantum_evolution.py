@@ -5,12 +5,13 @@
 
 import numpy as np
 from scipy.linalg import expm
+from sparse_graph import load_sparse
 
-H_PATH = "database/H.npy"
+H_PATH = "database/H.npz"
 P_OUT = "outputs/probabilities_base.npy"
 
 def evolve_ctqw(T=200, dt=0.05):
-    H = np.load(H_PATH)
+    H = load_sparse(H_PATH).toarray()
     N = H.shape[0]
 
     psi = np.zeros(N, dtype=complex)
@@ -1,10 +1,11 @@
 # w3_segment_index.py
-import pickle
+import feature_store
+from virtual_segments import segment_source
 
-DB_PATH = "database/master_db.pkl"
+DB_PATH = "database/master_db"
 
 def load_segments():
-    db = pickle.load(open(DB_PATH, "rb"))
+    db = feature_store.load_segments(DB_PATH)
     segments = []
 
     for seg in db:
@@ -14,6 +15,7 @@ def load_segments():
             "start": seg.start,
             "end": seg.end,
             "wav": seg.wav_path,              # ✔ ACTUALLY STORED INSIDE SEGMENT
+            "source": segment_source(seg),    # WAV path or (song, start_sample, end_sample)
             "index": seg.global_index
         })
 
@@ -1,25 +1,34 @@
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from eigen_cache import load_or_compute
+from sparse_graph import load_sparse, save_sparse, degree_vector, laplacian
+from graph_validation import symmetry_error
+from scipy.sparse.csgraph import connected_components
+from spectrum import spectrum_report, spectral_statistics, extreme_gap, EXACT_MAX_N, N_EXTREME
 
 # ===============================
 # PATHS
 # ===============================
-ADJ_PATH = "database/adjacency_sym.npy"
-SAVE_H_PATH = "database/H.npy"         # final hamiltonian saved here
+ADJ_PATH = "database/adjacency_sym.npz"
+SAVE_H_PATH = "database/H.npz"         # final hamiltonian saved here (sparse)
 NOTES_DIR = "notes"                    # optional folder
 os.makedirs(NOTES_DIR, exist_ok=True)
 
+# "exact": full eigh (cached), "partial": Lanczos extremes + SLQ density,
+# "auto": exact up to EXACT_MAX_N nodes
+SPECTRUM_MODE = "auto"
+HIST_BINS = 60
+
 # ===============================
 # 1. Load adjacency
 # ===============================
-A = np.load(ADJ_PATH)   # already symmetrised
+A = load_sparse(ADJ_PATH)   # already symmetrised
 N = A.shape[0]
 
-print(f"[LOAD] Adjacency loaded: shape = {A.shape}")
+print(f"[LOAD] Adjacency loaded: shape = {A.shape}, nnz = {A.nnz}")
 assert A.shape[0] == A.shape[1], "Adjacency must be square!"
-assert np.allclose(A, A.T), "[ERROR] A is not symmetric — CTQW invalid!"
+assert symmetry_error(A) <= 1e-8, "[ERROR] A is not symmetric — CTQW invalid!"
 
 print("[OK] Symmetry check passed ✔")
 
@@ -27,8 +36,7 @@ print("[OK] Symmetry check passed ✔")
 # ===============================
 # 2. Degree matrix D
 # ===============================
-deg = np.sum(A, axis=1)
-D = np.diag(deg)
+deg = degree_vector(A)
 
 print(f"[INFO] Degree stats → min={deg.min():.4f}, max={deg.max():.4f}, mean={deg.mean():.4f}")
 
@@ -37,11 +45,11 @@ print(f"[INFO] Degree stats → min={deg.min():.4f}, max={deg.max():.4f}, mean={
 # 3. Generate Hamiltonians
 # ===============================
 HA = A.copy()
-HL = D - A
+HL = laplacian(A)
 
 # sanity checks
-assert np.allclose(HA, HA.T), "HA not symmetric!"
-assert np.allclose(HL, HL.T), "HL not symmetric!"
+assert symmetry_error(HA) <= 1e-8, "HA not symmetric!"
+assert symmetry_error(HL) <= 1e-8, "HL not symmetric!"
 
 print("[OK] Hamiltonian symmetry verified ✔")
 
@@ -49,22 +57,56 @@ print("[OK] Hamiltonian symmetry verified ✔")
 # ===============================
 # 4. Eigenvalues
 # ===============================
-print("\n[!] Computing eigenvalues... may take a moment.")
-eig_A, _ = np.linalg.eigh(HA)
-eig_L, _ = np.linalg.eigh(HL)
+exact = SPECTRUM_MODE == "exact" or (SPECTRUM_MODE == "auto" and N <= EXACT_MAX_N)
+print(f"\n[!] Computing eigenvalues ({'exact' if exact else 'Lanczos + SLQ'})... may take a moment.")
+
+if exact:
+    eig_A, _ = load_or_compute(A, "adjacency")
+    eig_L, _ = load_or_compute(A, "laplacian")
+    spec_A = spectrum_report(HA, "exact", eigvals=eig_A)
+    spec_L = spectrum_report(HL, "exact", eigvals=eig_L)
+else:
+    spec_A = spectrum_report(HA, "partial")
+    spec_L = spectrum_report(HL, "partial")
 
 print("\n====== EIGEN SUMMARY ======")
-print(f"Adjacency H_A spectrum: min={eig_A.min():.4f}, max={eig_A.max():.4f}")
-print(f"Laplacian H_L spectrum: min={eig_L.min():.4f}, max={eig_L.max():.4f}")
+print(f"Adjacency H_A spectrum: min={spec_A['min']:.4f}, max={spec_A['max']:.4f}")
+print(f"Laplacian H_L spectrum: min={spec_L['min']:.4f}, max={spec_L['max']:.4f}")
+
+# level statistics need the full spectrum; partial mode reports gaps only.
+# H_A: gap between its top two levels; H_L: gap above the zero level
+if exact:
+    stats_A = spectral_statistics(eig_A)
+    stats_L = spectral_statistics(eig_L)
+    for name, stats, gap in (("H_A", stats_A, stats_A["top_gap"]),
+                             ("H_L", stats_L, stats_L["spectral_gap"])):
+        print(f"{name}: levels={stats['num_levels']}, degeneracies={stats['degeneracies']}, "
+              f"spectral gap={gap:.4f}, mean spacing={stats['mean_spacing']:.4f}")
+else:
+    n_comp, _ = connected_components(A, directed=False)
+    gap_A = extreme_gap(HA, "top", spec_A["highest"])
+    gap_L = extreme_gap(HL, "bottom", spec_L["lowest"], k=max(N_EXTREME, n_comp + 1))
+    for name, gap in (("H_A", gap_A), ("H_L", gap_L)):
+        print(f"{name}: levels=n/a (partial), degeneracies=n/a (partial), "
+              f"spectral gap={gap:.4f}, mean spacing=n/a (partial)")
 print("===========================\n")
 
+
+def plot_spectrum(spec, color):
+    if spec["mode"] == "exact":
+        sns.histplot(spec["eigvals"], kde=True, color=color)
+    else:
+        # SLQ density estimate, weights sum to N
+        plt.hist(spec["density_nodes"], bins=HIST_BINS,
+                 weights=spec["density_weights"], color=color, alpha=0.7)
+
 # ===============================
 # 5. Plots
 # ===============================
 sns.set_theme(style="whitegrid")
 
 plt.figure(figsize=(10,5))
-sns.histplot(eig_A, kde=True, color="blue")
+plot_spectrum(spec_A, "blue")
 plt.title("Spectrum of Adjacency Hamiltonian H_A")
 plt.xlabel("Eigenvalue")
 plt.ylabel("Density")
@@ -72,7 +114,7 @@ plt.savefig("outputs/hist_HA_spectrum.png")
 print("[SAVE] outputs/hist_HA_spectrum.png")
 
 plt.figure(figsize=(10,5))
-sns.histplot(eig_L, kde=True, color="red")
+plot_spectrum(spec_L, "red")
 plt.title("Spectrum of Laplacian Hamiltonian H_L")
 plt.xlabel("Eigenvalue")
 plt.ylabel("Density")
@@ -87,5 +129,5 @@ print("[SAVE] outputs/hist_HL_spectrum.png")
 # Here we assume you choose HL (common for diffusion/transport)
 H_final = HL   # <--- switch to HA if needed
 
-np.save(SAVE_H_PATH, H_final)
+save_sparse(SAVE_H_PATH, H_final)
 print(f"[DONE] Saved chosen Hamiltonian → {SAVE_H_PATH}")
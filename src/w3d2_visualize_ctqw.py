@@ -2,11 +2,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-import pickle
+from feature_store import load_segments
+from sparse_graph import load_sparse
 
 PROB_PATH = "outputs/prob_evolution.npy"
-PKL_DB     = "database/master_db_features_norm.pkl"
-H_PATH     = "database/H.npy"
+DB_PATH    = "database/master_db_features_norm"
+H_PATH     = "database/H.npz"
 SAVE_HEAT  = "outputs/probability_heatmap.png"
 SAVE_TOP   = "outputs/top_state_trajectories.png"
 SAVE_LABEL = "outputs/segment_labels.txt"
@@ -15,9 +16,8 @@ os.makedirs("outputs", exist_ok=True)
 
 # Load probability evolution & DB
 prob = np.load(PROB_PATH)
-H    = np.load(H_PATH)
-with open(PKL_DB, "rb") as f:
-    db = pickle.load(f)
+H    = load_sparse(H_PATH)
+db = load_segments(DB_PATH)
 
 T, N = prob.shape
 print(f"[LOAD] Probabilities shape = {prob.shape}")
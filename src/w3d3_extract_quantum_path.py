@@ -1,8 +1,9 @@
 import numpy as np
-import pickle, json, os
+import json, os
+from feature_store import load_segments
 
 # ==== CONFIG ====
-PKL_DB   = "database/master_db_features_norm.pkl"     # Final 64 clean segments
+DB_PATH  = "database/master_db_features_norm"         # Final 64 clean segments
 PROB_NPY = "outputs/prob_evolution.npy"               # From CTQW step
 OUT_JSON = "outputs/quantum_path.json"
 
@@ -10,8 +11,7 @@ MEMORY_BLOCK = 3       # no immediate repeats
 TOP_T        = 60      # first 60 timesteps enough for 10-20 segments
 
 print("[LOAD] Loading segment DB...")
-with open(PKL_DB, "rb") as f:
-    segments = pickle.load(f)
+segments = load_segments(DB_PATH)
 
 # Sort by global_index to match matrix ordering
 segments = sorted(segments, key=lambda s: s.global_index)
@@ -1,11 +1,11 @@
 import numpy as np
-import pickle
+from feature_store import load_segments
 import json
 import os
 from collections import deque
 
 PROB_PATH = "outputs/prob_evolution.npy"
-DB_PATH   = "database/master_db_features_norm.pkl"
+DB_PATH   = "database/master_db_features_norm"
 OUT_PATH  = "outputs/quantum_path.json"
 
 os.makedirs("outputs", exist_ok=True)
@@ -16,8 +16,7 @@ T, N = prob.shape
 print(f"[LOAD] Probability evolution loaded: T={T}, N={N}")
 
 # Load DB
-with open(DB_PATH, "rb") as f:
-    db = pickle.load(f)
+db = load_segments(DB_PATH)
 
 assert len(db) == N, "DB size mismatch with probability matrix!"
 # -------------------------
@@ -1,64 +1,46 @@
-import numpy as np
-import pickle
+from feature_store import load_segments
+from sparse_graph import load_sparse
+from ctqw_sweep import run_sweep, find_point
 
-ADJ = "database/adjacency_sym.npy"
-DB  = "database/master_db_features_norm.pkl"
-OUT_PREFIX = "outputs/prob_evolution_"
+ADJ = "database/adjacency_sym.npz"
+DB  = "database/master_db_features_norm"
+OUT_DIR = "outputs/decoherence_sweep"   # probs.npy + index.npz
 
 T = 200           # time steps
 dt = 0.05         # step size
 LAMBDA_VALUES = [0.0, 0.15, 0.80]   # coherent / ENAQT / noisy
+METHOD = "krylov"  # sparse expm_multiply; "eigen" shares one eigh across the grid
 
-print("[LOAD] adjacency -> Hamiltonian")
-A = np.load(ADJ)
-H = -A  # adjacency Hamiltonian (simple choice)
 
-# load DB to enforce consistent ordering
-with open(DB,"rb") as f:
-    segs = sorted(pickle.load(f), key=lambda s: s.global_index)
+def main():
+    print("[LOAD] adjacency -> Hamiltonian")
+    A = load_sparse(ADJ)
 
-N = len(segs)
+    # load DB to enforce consistent ordering
+    segs = sorted(load_segments(DB), key=lambda s: s.global_index)
 
-# classical noise vector
-deg = A.sum(axis=1)
-eta_deg = deg / deg.sum()          # prefer high-degree nodes
-eta_uniform = np.ones(N)/N         # full random reference
+    N = len(segs)
+    assert A.shape[0] == N, "DB size mismatch with adjacency!"
 
-# ==== EVOLUTION FUNCTION ====
+    # ==== RUN ALL 3 REGIMES AS ONE SWEEP ====
+    # Adjacency Hamiltonian (simple choice). H = A and H = -A give identical
+    # probabilities for a real start state and real noise vector.
+    # Noise: degree-weighted for lambda < 0.5, uniform above ("regime").
 
-def evolve(lambda_noise):
+    index = run_sweep(
+        A, OUT_DIR,
+        lambda_noise=LAMBDA_VALUES, dt=(dt,), T=(T,),
+        start_idx=0,                    # start at segment 0 (change if needed)
+        kind="adjacency",
+        eta_mode="regime",
+        method=METHOD,
+    )
 
-    psi = np.zeros(N, dtype=complex)
-    psi[0] = 1.0                    # start at segment 0 (change if needed)
+    print("\n[DONE] Generated probability store:", OUT_DIR)
+    for name, lam in zip(["coherent", "enaqt   ", "noisy   "], LAMBDA_VALUES):
+        print(f" - {name}: row {find_point(index, lambda_noise=lam)}")
 
-    prob = np.zeros((T,N))
 
-    for t in range(T):
-        # record probability distribution
-        prob[t] = np.abs(psi)**2
-
-        # quantum evolution step
-        psi = psi - 1j * (H @ psi) * dt
-
-        # decoherence mix
-        if lambda_noise > 0:
-            noise = eta_deg if lambda_noise<0.5 else eta_uniform
-            psi = (1-lambda_noise)*psi + lambda_noise*noise
-
-        # re-normalize
-        psi = psi / np.linalg.norm(psi)
-
-    return prob
-
-
-# ==== RUN ALL 3 REGIMES ====
-
-for lam in LAMBDA_VALUES:
-    print(f"[RUN] lambda={lam} ...")
-    prob_matrix = evolve(lam)
-    np.save(f"{OUT_PREFIX}{lam}.npy", prob_matrix)
-
-print("\n[DONE] Generated probability matrices:")
-print(" - coherent:", OUT_PREFIX+"0.0.npy")
-print(" - enaqt   :", OUT_PREFIX+"0.15.npy")
-print(" - noisy   :", OUT_PREFIX+"0.80.npy")
+# run_sweep uses a process pool: workers re-import this module
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
-import numpy as np, librosa, soundfile as sf, os, argparse
+import numpy as np, soundfile as sf, os, argparse
 from w3_segment_index import load_segments
 from scipy.signal import resample
+from mix_render import render_path
+from segment_cache import load_segment_audio, get_cache
 
 PROB_PATH_COH   = "outputs/prob_coherent.npy"
 PROB_PATH_ENAQT = "outputs/prob_enaqt.npy"
@@ -43,22 +45,18 @@ def extract_path(prob, mode="coherent", L=20, avoid_recent=3):
 
 def build_mix(indices, sr=22050, crossfade_ms=120):
     segs = load_segments()
-    audio = np.array([])
-
-    for ix in indices:
-        file = segs[ix]["wav"]
-        y,_ = librosa.load(file, sr=sr)
-
-        if len(audio) == 0:
-            audio = y
-        else:
-            cf = int(sr*crossfade_ms/1000)
-            fade_in  = np.linspace(0,1,cf)
-            fade_out = np.linspace(1,0,cf)
-            audio[-cf:] = audio[-cf:]*fade_out + y[:cf]*fade_in
-            audio = np.concatenate([audio, y[cf:]])
-
-    return audio
+    cf = int(sr*crossfade_ms/1000)
+    cache_sr = get_cache().sr
+
+    def load(ix):
+        y = load_segment_audio(segs[ix]["id"], segs[ix]["source"])
+        if sr != cache_sr:
+            # the cache decodes at its own rate; resample like read_segment_audio
+            import librosa
+            y = librosa.resample(y, orig_sr=cache_sr, target_sr=sr)
+        return y
+
+    return render_path(indices, load, cf)
 
 
 def build(mode):
@@ -1,8 +1,8 @@
-import numpy as np
-from scipy.linalg import expm
+from ctqw_engine import basis_state, stream_walk_to_npy
+from sparse_graph import load_sparse
 
-H_PATH     = "database/H.npy"
-H_BIO_PATH = "database/H_bio.npy"
+H_PATH     = "database/H.npz"
+H_BIO_PATH = "database/H_bio.npz"
 
 OUT_NO_BIO  = "outputs/prob_no_bio.npy"
 OUT_WITH_BIO = "outputs/prob_with_bio.npy"
@@ -10,27 +10,15 @@ OUT_WITH_BIO = "outputs/prob_with_bio.npy"
 T  = 200
 dt = 0.05
 
-def evolve(H):
-    N = H.shape[0]
-    psi = np.zeros(N, dtype=complex)
-    psi[0] = 1.0
+def evolve(H, out_path):
+    # sparse Krylov action, probabilities streamed to disk in time-chunks
+    psi0 = basis_state(H.shape[0], 0)
+    return stream_walk_to_npy(out_path, H, psi0, T, dt, first_step=1)
 
-    probs = np.zeros((T, N))
+H      = load_sparse(H_PATH)
+H_bio  = load_sparse(H_BIO_PATH)
 
-    for t in range(T):
-        psi = expm(-1j * H * dt) @ psi
-        psi /= np.linalg.norm(psi)
-        probs[t] = np.abs(psi)**2
-
-    return probs
-
-H      = np.load(H_PATH)
-H_bio  = np.load(H_BIO_PATH)
-
-prob_no_bio   = evolve(H)
-prob_with_bio = evolve(H_bio)
-
-np.save(OUT_NO_BIO, prob_no_bio)
-np.save(OUT_WITH_BIO, prob_with_bio)
+evolve(H, OUT_NO_BIO)
+evolve(H_bio, OUT_WITH_BIO)
 
 print("[DONE] Saved bio vs no-bio probability evolutions")
@@ -1,7 +1,9 @@
 import numpy as np
+import scipy.sparse as sp
+from sparse_graph import save_sparse
 
 NODES = 64
-OUT_PATH = "database/V_bio.npy"
+OUT_PATH = "database/V_bio.npz"
 
 # Toy bio spectrum: slow + fast vibrational modes
 np.random.seed(42)
@@ -13,7 +15,7 @@ bio_spectrum = np.concatenate([low_freq, high_freq])
 np.random.shuffle(bio_spectrum)
 
 # Diagonal operator
-V_bio = np.diag(bio_spectrum)
+V_bio = sp.diags(bio_spectrum)
 
-np.save(OUT_PATH, V_bio)
+save_sparse(OUT_PATH, V_bio)
 print(f"[DONE] Bio operator saved → {OUT_PATH}")
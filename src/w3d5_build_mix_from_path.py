@@ -1,51 +1,40 @@
 import json
-import pickle
+from feature_store import load_segments
 import soundfile as sf
-import numpy as np
 import os
+from mix_render import render_path
+from segment_cache import load_segment_audio
+from virtual_segments import segment_source
 
 SR = 22050
 CROSSFADE_MS = 120
 
-DB_PATH = "database/master_db_features_norm.pkl"
+DB_PATH = "database/master_db_features_norm"
 PATH_NO_BIO  = "outputs/path_no_bio.json"
 PATH_BIO     = "outputs/path_with_bio.json"
 
 def load_db():
-    with open(DB_PATH, "rb") as f:
-        db = pickle.load(f)
+    db = load_segments(DB_PATH)
     return {seg.id: seg for seg in db}
 
 def load_path(path_json):
     with open(path_json) as f:
         return json.load(f)
 
-def stitch(path, seg_db, out_wav):
-    audio = np.array([], dtype=np.float32)
-    cf = int(SR * CROSSFADE_MS / 1000)
-
-    for step in path:
-        seg_id = step["segment"]
-        seg = seg_db[seg_id]
+def load_segment(seg_id, seg_db):
+    seg = seg_db[seg_id]
 
-        wav_path = seg.wav_path   # 🔑 SINGLE SOURCE OF TRUTH
+    source = segment_source(seg)   # 🔑 SINGLE SOURCE OF TRUTH (WAV or song slice)
 
-        if not os.path.exists(wav_path):
-            raise FileNotFoundError(f"Missing WAV: {wav_path}")
+    # float32 mono at SR, decoded once per process; the audio bank is
+    # checked first, so the WAV only has to exist on a bank miss
+    return load_segment_audio(seg_id, source)
 
-        y, sr = sf.read(wav_path)
-        if y.ndim > 1:
-            y = y.mean(axis=1)
-
-        assert sr == SR, f"Sample rate mismatch in {wav_path}"
+def stitch(path, seg_db, out_wav):
+    cf = int(SR * CROSSFADE_MS / 1000)
 
-        if len(audio) == 0:
-            audio = y
-        else:
-            fade_out = np.linspace(1, 0, cf)
-            fade_in  = np.linspace(0, 1, cf)
-            audio[-cf:] = audio[-cf:] * fade_out + y[:cf] * fade_in
-            audio = np.concatenate([audio, y[cf:]])
+    seg_ids = [step["segment"] for step in path]
+    audio = render_path(seg_ids, lambda seg_id: load_segment(seg_id, seg_db), cf)
 
     sf.write(out_wav, audio, SR)
     print("[SAVE]", out_wav)
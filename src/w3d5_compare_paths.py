@@ -1,10 +1,11 @@
 import numpy as np
-import pickle, json
+import json
 from collections import deque
+from feature_store import load_segments
 
 PROB_NO_BIO   = "outputs/prob_no_bio.npy"
 PROB_WITH_BIO = "outputs/prob_with_bio.npy"
-DB_PATH       = "database/master_db_features_norm.pkl"
+DB_PATH       = "database/master_db_features_norm"
 
 OUT_NO_BIO   = "outputs/path_no_bio.json"
 OUT_WITH_BIO = "outputs/path_with_bio.json"
@@ -29,8 +30,7 @@ def extract_path(prob, segments):
     return path
 
 # Load DB
-with open(DB_PATH, "rb") as f:
-    segments = sorted(pickle.load(f), key=lambda s: s.global_index)
+segments = sorted(load_segments(DB_PATH), key=lambda s: s.global_index)
 
 # Load probs
 prob_no   = np.load(PROB_NO_BIO)
@@ -1,9 +1,11 @@
-import os, json, pickle
-import numpy as np
-import librosa
+import os, json
 import soundfile as sf
+from mix_render import render_path
+from segment_cache import load_segment_audio
+from virtual_segments import segment_source
+from feature_store import load_segments
 
-DB_FILE = "database/master_db.pkl"
+DB_FILE = "database/master_db"
 PATH_FILE = "outputs/path_with_bio.json"     # modify if needed
 OUT_FILE = "outputs/mashup_quantum.wav"
 
@@ -12,34 +14,16 @@ CROSSFADE_MS = 80
 CROSS = int(SR * CROSSFADE_MS / 1000)
 
 
-def crossfade(base, new):
-    """Smooth join with crossfade"""
-    if base is None:
-        return new.copy()
-
-    if len(base) < CROSS or len(new) < CROSS:
-        return np.concatenate([base, new])
-
-    fade_out = np.linspace(1,0,CROSS)
-    fade_in  = np.linspace(0,1,CROSS)
-
-    base[-CROSS:] *= fade_out
-    new[:CROSS]   *= fade_in
-
-    return np.concatenate([base, new])
-
-
 def build_final():
     print("\n🔍 Loading DB + Path ...")
 
     # load segment objects
-    with open(DB_FILE,"rb") as f:
-        db = pickle.load(f)
+    db = load_segments(DB_FILE)
 
     print(f"📁 Segments loaded: {len(db)}")
 
-    # Build ID → WAV lookup
-    id_to_wav = {seg.id: seg.wav_path for seg in db}
+    # Build ID → audio source lookup (WAV path or song slice)
+    id_to_wav = {seg.id: segment_source(seg) for seg in db}
 
     # load quantum path
     with open(PATH_FILE) as f:
@@ -48,22 +32,23 @@ def build_final():
     segment_ids = [x["segment"] for x in data]   # JSON format confirmed
     print(f"🎶 Track length: {len(segment_ids)} segments\n")
 
-    track = None
+    mix_ids = []
 
     for i, seg_id in enumerate(segment_ids,1):
         if seg_id not in id_to_wav:
             print(f"⚠ {seg_id} missing — skipped")
             continue
 
-        wav = id_to_wav[seg_id]
-        audio,_ = librosa.load(wav, sr=SR)
-
-        track = crossfade(track, audio)
-
-        print(f" [{i}/{len(segment_ids)}] Mixed {seg_id}")
+        mix_ids.append(seg_id)
+        print(f" [{i}/{len(segment_ids)}] Queued {seg_id}")
 
-    # normalize audio
-    track /= np.max(np.abs(track)) + 1e-9
+    # single-pass crossfade render, normalized
+    track = render_path(
+        mix_ids,
+        lambda seg_id: load_segment_audio(seg_id, id_to_wav[seg_id]),
+        CROSS,
+        normalize=True
+    )
 
     sf.write(OUT_FILE, track, SR)
     print(f"\n🎉 FINAL MASHUP CREATED → {OUT_FILE}")
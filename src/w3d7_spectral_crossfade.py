@@ -1,8 +1,9 @@
 import numpy as np
 import soundfile as sf
-import pickle, json, os
+import json, os
 import matplotlib.pyplot as plt
 from scipy.signal import stft, istft
+from feature_store import load_segments
 
 # =========================
 # CONFIG
@@ -12,7 +13,7 @@ N_FFT = 2048
 HOP = 512
 CROSSFADE_FRAMES = 12   # ~140 ms
 
-DB_PATH   = "database/master_db.pkl"
+DB_PATH   = "database/master_db"
 PATH_JSON = "outputs/path_with_bio.json"
 OUT_DIR   = "outputs"
 
@@ -21,8 +22,7 @@ os.makedirs(OUT_DIR, exist_ok=True)
 # =========================
 # LOAD DB + PATH
 # =========================
-with open(DB_PATH, "rb") as f:
-    db = pickle.load(f)
+db = load_segments(DB_PATH)
 
 id_to_seg = {seg.id: seg for seg in db}
 
@@ -0,0 +1,47 @@
+"""
+Best-next-segment table from a batched multi-start CTQW.
+
+Every node is used as an initial segment; all walks are evolved
+together and reduced to a time-averaged distribution per start.
+"""
+
+import numpy as np
+from ctqw_engine import evolve_walk_batch, best_next_segments
+from eigen_cache import load_or_compute
+from hamiltonian_ops import noise_distribution
+from sparse_graph import load_sparse
+
+# =========================
+# CONFIG
+# =========================
+ADJ_PATH = "database/adjacency_sym.npz"
+OUT_PATH = "outputs/next_segment_table.npy"
+
+T = 150
+DT = 0.05
+LAMBDA_NOISE = 0.15
+TOP_K = 5
+
+# =========================
+# LOAD + DIAGONALIZE
+# =========================
+A = load_sparse(ADJ_PATH)
+N = A.shape[0]
+print(f"[LOAD] Graph with {N} nodes")
+
+eigvals, eigvecs = load_or_compute(A, "laplacian")
+eta = noise_distribution(A, "laplacian")
+
+# =========================
+# BATCHED WALK (ALL STARTS)
+# =========================
+starts = np.arange(N)
+avg_prob = evolve_walk_batch(
+    eigvals, eigvecs, starts, T, DT,
+    lambda_noise=LAMBDA_NOISE, eta=eta, reduce="mean"
+)
+
+table = best_next_segments(avg_prob, starts, k=TOP_K)   # (N, TOP_K)
+
+np.save(OUT_PATH, table)
+print(f"[SAVE] Next-segment table {table.shape} → {OUT_PATH}")